@@ -1,12 +1,21 @@
 """Pipeline CLI."""
 
+import argparse
+
 from cly import config
 
 from . import __version__
+from .buildcache import CACHE_TYPES
+from .commands.bake import bake
 from .commands.cd_jobs import generate_cd_jobs
 from .commands.ci_jobs import generate_ci_jobs
 from .commands.dockerfiles import generate_dockerfiles
+from .commands.mirror import mirror
+from .commands.plan import plan
+from .commands.retag import retag
+from .commands.time_build import time_build
 from .commands.update import update
+from .selector import parse_selector
 
 CLI_CONFIG = {
     "name": "Generator",
@@ -25,8 +34,53 @@ dockerfile_command = CLI.create_command(
     generate_dockerfiles, alias="dockerfiles"
 )
 dockerfile_command.add_argument("-v", "--version", metavar="str", type=str)
-CLI.create_command(generate_ci_jobs, alias="ci")
-CLI.create_command(generate_cd_jobs, alias="cd")
+dockerfile_command.add_argument("--check", action="store_true")
+dockerfile_command.add_argument("--from-matrix", metavar="str", type=str)
+dockerfile_command.add_argument("--out", metavar="str", type=str)
+dockerfile_command.add_argument("--watch", action="store_true")
+ci_command = CLI.create_command(generate_ci_jobs, alias="ci")
+cd_command = CLI.create_command(generate_cd_jobs, alias="cd")
+cd_command.add_argument("--record", action="store_true")
+cd_command.add_argument("--cache", choices=CACHE_TYPES)
+cd_command.add_argument("--force-fresh", action="store_true")
+bake_command = CLI.create_command(bake)
+bake_command.add_argument("--cd", dest="cd_only", action="store_true")
+bake_command.add_argument("-o", "--output", metavar="str", type=str)
+mirror_command = CLI.create_command(mirror)
+mirror_command.add_argument(
+    "-v", "--version", dest="versions", metavar="str", type=str, nargs="+"
+)
+mirror_command.add_argument("-j", "--jobs", metavar="int", type=int, default=4)
+for command in (
+    dockerfile_command,
+    ci_command,
+    cd_command,
+    bake_command,
+    mirror_command,
+):
+    command.add_argument("--select", metavar="str", type=parse_selector)
+for command in (ci_command, cd_command):
+    shards_group = command.add_mutually_exclusive_group()
+    shards_group.add_argument("--shards", metavar="int", type=int)
+    shards_group.add_argument("--max-jobs", metavar="int", type=int)
+    shards_group.add_argument("--pack-by-base", action="store_true")
+    command.add_argument("--timings", metavar="str", type=str)
+plan_command = CLI.create_command(plan)
+plan_command.add_argument("-o", "--output", metavar="str", type=str)
+plan_command.add_argument("--render", action="store_true")
+plan_command.add_argument("--max-jobs", metavar="int", type=int)
+plan_command.add_argument("--cache", choices=CACHE_TYPES)
+retag_command = CLI.create_command(retag)
+retag_command.add_argument("--apply", action="store_true")
+retag_command.add_argument("--repository", metavar="str", type=str)
+time_build_command = CLI.create_command(time_build, alias="time-build")
+time_build_command.add_argument(
+    "-v", "--version", metavar="str", type=str, required=True
+)
+time_build_command.add_argument("--timings", metavar="str", type=str)
+time_build_command.add_argument(
+    "build_command", metavar="command", nargs=argparse.REMAINDER
+)
 update_command = CLI.create_command(update)
 group = update_command.add_mutually_exclusive_group(required=True)
 group.add_argument(
@@ -0,0 +1,72 @@
+"""Docker Bake files of project's Images."""
+
+from typing import Any, Callable, Dict, List
+
+from .config import BAKE_CONTEXT_FOLDER, IMAGE_REPOSITORY
+from .targets import BuildTarget
+
+BakeFile = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def get_target_name(version: str) -> str:
+    """
+    Get Bake target name of Image version.
+
+    Parameters
+    ----------
+    version : str
+        Full version of the Image.
+
+    Returns
+    -------
+    str
+        Version with dots replaced, as Bake names do not accept them.
+
+    """
+    return version.replace(".", "_")
+
+
+def get_bake_file(
+    targets: List[BuildTarget], render: Callable[[BuildTarget], str]
+) -> BakeFile:
+    """
+    Get Docker Bake file building targets.
+
+    Each target has its rendered Dockerfile inline and its tags. As the
+    Dockerfiles copy files only from their own stages, targets use an empty
+    folder as build context, instead of sending the project to the builder.
+    Targets are grouped by Python version, so a group shares the pulls of
+    its base Images; the default group builds all targets.
+
+    Parameters
+    ----------
+    targets : List[BuildTarget]
+        Build targets of the Images.
+    render : Callable[[BuildTarget], str]
+        Function rendering the Dockerfile of a target.
+
+    Returns
+    -------
+    BakeFile
+        Docker Bake file, in JSON format.
+
+    """
+    groups: Dict[str, List[str]] = {"default": []}
+    bake_targets: Dict[str, Dict[str, Any]] = {}
+    for target in targets:
+        name = get_target_name(target.version)
+        bake_targets[name] = {
+            "context": BAKE_CONTEXT_FOLDER.as_posix(),
+            "dockerfile-inline": render(target),
+            "tags": [f"{IMAGE_REPOSITORY}:{tag}" for tag in target.tags],
+        }
+        groups["default"].append(name)
+        groups.setdefault(
+            get_target_name(f"python{target.python_version}"), []
+        ).append(name)
+    return {
+        "group": {
+            name: {"targets": members} for name, members in groups.items()
+        },
+        "target": bake_targets,
+    }
@@ -0,0 +1,74 @@
+"""BuildKit cache references of project's Images."""
+
+from typing import Dict
+
+from .config import BUILD_CACHE_FOLDER, BUILD_CACHE_REPOSITORY
+
+CACHE_TYPES = ("registry", "local")
+
+
+def get_cache_key(
+    python_version: str, variation: str, template_digest: str
+) -> str:
+    """
+    Get key of the build cache shared by Images of a Python base.
+
+    Parameters
+    ----------
+    python_version : str
+        Python version in format major.minor.patch.
+    variation : str
+        Python Oficial Image variation (for example, bullseye).
+    template_digest : str
+        Hash of the variation's template and its fragments.
+
+    Returns
+    -------
+    str
+        Build cache key, valid as a Docker tag.
+
+    """
+    return f"python{python_version}-{variation}-{template_digest[:12]}"
+
+
+def get_cache_options(
+    key: str, cache_type: str, force_fresh: bool = False
+) -> Dict[str, str]:
+    """
+    Get docker buildx build cache options of build cache key.
+
+    Parameters
+    ----------
+    key : str
+        Build cache key.
+    cache_type : str
+        Type of the build cache, registry or local.
+    force_fresh : bool, optional
+        Build without reading the cache, only refreshing it, by default False
+
+    Returns
+    -------
+    Dict[str, str]
+        Options to import (cache-from) and export (cache-to) the build cache.
+
+    Raises
+    ------
+    ValueError
+        If cache type is unknown.
+
+    """
+    if cache_type == "registry":
+        source = f"type=registry,ref={BUILD_CACHE_REPOSITORY}:{key}"
+        destination = f"{source},mode=max"
+    elif cache_type == "local":
+        folder = (BUILD_CACHE_FOLDER / key).as_posix()
+        source = f"type=local,src={folder}"
+        destination = f"type=local,dest={folder},mode=max"
+    else:
+        raise ValueError(f"unknown build cache type {cache_type!r}")
+    return {
+        "cache-from": "--no-cache"
+        if force_fresh
+        else f"--cache-from {source}",
+        "cache-to": f"--cache-to {destination}",
+    }
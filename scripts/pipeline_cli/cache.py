@@ -0,0 +1,146 @@
+"""On-disk cache of pipeline plans, keyed on the hash of their inputs."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .config import (
+    FRAGMENT_FOLDER,
+    NEW_VERSIONS_FILE,
+    PLAN_CACHE_FOLDER,
+    PLAN_CACHE_MAX_SIZE,
+    PROJECT_ROOT,
+    PUBLISHED_FILE,
+    TEMPLATE_FOLDER,
+)
+from .files import atomic_write, get_hash
+from .selector import Selector
+
+PACKAGE_FOLDER = Path(__file__).resolve().parent
+
+
+def get_input_files() -> List[Path]:
+    """
+    Get files that pipeline plans are computed from.
+
+    Pipeline CLI source files (config.py included) are part of the inputs,
+    so changing how plans are computed also invalidates the cache.
+
+    Returns
+    -------
+    List[Path]
+        Paths of the input files, in a stable order.
+
+    """
+    return [
+        *sorted(PACKAGE_FOLDER.rglob("*.py")),
+        NEW_VERSIONS_FILE,
+        PUBLISHED_FILE,
+        *sorted(TEMPLATE_FOLDER.glob("*.template")),
+        *sorted(FRAGMENT_FOLDER.glob("*.template")),
+    ]
+
+
+def get_inputs_hash() -> str:
+    """
+    Get hash of the files that pipeline plans are computed from.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the path and data of each input file.
+
+    """
+    digest = hashlib.sha256()
+    for path in get_input_files():
+        try:
+            data = path.read_bytes()
+        except OSError:
+            data = b""
+            digest.update(b"missing:")
+        digest.update(
+            f"{path.relative_to(PROJECT_ROOT)}\0{len(data)}\0".encode()
+        )
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def evict_entries(folder: Path, max_size: int) -> None:
+    """
+    Remove least recently used cache entries until folder fits in max size.
+
+    Parameters
+    ----------
+    folder : Path
+        Cache folder.
+    max_size : int
+        Maximum size, in bytes, of the cache entries.
+
+    """
+    entries: List[Tuple[int, int, Path]] = []
+    for path in folder.glob("*.cache"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    size = sum(entry_size for _, entry_size, _ in entries)
+    for _, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        size -= entry_size
+
+
+def cached(
+    name: str,
+    compute: Callable[[], str],
+    select: Optional[Selector] = None,
+) -> str:
+    """
+    Get cached result, computing and storing it if inputs changed.
+
+    A cache hit marks the entry as recently used. After storing a result,
+    least recently used entries are removed so the cache stays under
+    PLAN_CACHE_MAX_SIZE bytes; a size of 0 disables the cache. Results of
+    selectors not parsed from text are not cached.
+
+    Parameters
+    ----------
+    name : str
+        Name of the result (for example, ci).
+    compute : Callable[[], str]
+        Function computing the result.
+    select : Optional[Selector], optional
+        Selector the result is computed with, by default None
+
+    Returns
+    -------
+    str
+        Cached or computed result.
+
+    """
+    if PLAN_CACHE_MAX_SIZE <= 0 or (select and select.source is None):
+        return compute()
+    if select:
+        name = f"{name}:{select.source}"
+    key = get_hash(f"{get_inputs_hash()}\0{name}".encode("utf-8"))
+    path = PLAN_CACHE_FOLDER / f"{key}.cache"
+    try:
+        result = path.read_text(encoding="utf-8")
+        os.utime(path)
+        return result
+    except OSError:
+        pass
+    result = compute()
+    try:
+        PLAN_CACHE_FOLDER.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, result.encode("utf-8"))
+        evict_entries(PLAN_CACHE_FOLDER, PLAN_CACHE_MAX_SIZE)
+    except OSError:
+        pass
+    return result
@@ -1,26 +1,193 @@
 """Pipeline commands."""
 
-from typing import Dict, List
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+from cly.colors import color_text
 
-def get_dockerfile_version(
-    minor_version: str,
-    versions: Dict[str, List[int]],
+from ..config import TIMINGS_FILE
+from ..packing import (
+    get_pull_volume,
+    get_version_base_images,
+    group_by_base_images,
+)
+from ..shards import get_shard_count, order_by_cost, pack_costs, shard_jobs
+from ..template import TemplateError
+from ..timings import Timings, get_job_costs, read_timings
+
+
+def load_timings(timings: Optional[str] = None) -> Timings:
+    """
+    Load build durations, if there are any.
+
+    Parameters
+    ----------
+    timings : Optional[str], optional
+        Path of build durations file, by default .pipeline_cache/timings.jsonl
+        if it exists.
+
+    Returns
+    -------
+    Timings
+        Build seconds of each Image version.
+
+    Raises
+    ------
+    SystemExit
+        If build durations file is invalid.
+
+    """
+    if not timings and not TIMINGS_FILE.exists():
+        return {}
+    try:
+        return read_timings(Path(timings) if timings else TIMINGS_FILE)
+    except (OSError, ValueError) as error:
+        print(color_text(f"ERROR: {error}", "red"))
+        raise SystemExit(1) from error
+
+
+def report_durations(packed: List[List[int]], costs: List[float]) -> None:
+    """
+    Print predicted durations of jobs to standard error.
+
+    Parameters
+    ----------
+    packed : List[List[int]]
+        Indexes of the jobs run in sequence by each matrix job.
+    costs : List[float]
+        Predicted seconds of each job.
+
+    """
+    totals = [sum(costs[index] for index in indexes) for indexes in packed]
+    print(
+        f"Predicted build time: {sum(totals):.0f}s in {len(totals)} jobs, "
+        f"{max(totals, default=0):.0f}s critical path",
+        file=sys.stderr,
+    )
+    if any(len(indexes) > 1 for indexes in packed):
+        for number, (indexes, total) in enumerate(zip(packed, totals), 1):
+            print(
+                f"  shard {number}: {len(indexes)} builds, {total:.0f}s",
+                file=sys.stderr,
+            )
+
+
+def pack_by_base_images(
+    jobs: List[Dict[str, str]], costs: List[float]
+) -> Tuple[List[List[int]], List[Dict[str, Any]]]:
+    """
+    Pack jobs sharing base Images into single jobs.
+
+    Prints the volume of base Images pulled before and after packing to
+    standard error.
+
+    Parameters
+    ----------
+    jobs : List[Dict[str, str]]
+        Jobs to pack.
+    costs : List[float]
+        Cost of each job.
+
+    Returns
+    -------
+    Tuple[List[List[int]], List[Dict[str, Any]]]
+        Indexes of the jobs of each packed job, and the packed jobs.
+
+    Raises
+    ------
+    SystemExit
+        If a template is invalid.
+
+    """
+    try:
+        bases = [get_version_base_images(job["version"]) for job in jobs]
+    except TemplateError as error:
+        print(color_text(f"ERROR: {error}", "red"))
+        raise SystemExit(1) from error
+    packed = [
+        sorted(indexes, key=lambda index: -costs[index])
+        for indexes in group_by_base_images(bases)
+    ]
+    packed_jobs = shard_jobs(jobs, packed)
+    for packed_job, indexes in zip(packed_jobs, packed):
+        packed_job["images"] = sorted(
+            {image for index in indexes for image in bases[index]}
+        )
+    unpacked = [[index] for index in range(len(jobs))]
+    print(
+        f"Base Images pulls: {get_pull_volume(unpacked, bases)} MB in "
+        f"{len(jobs)} jobs, {get_pull_volume(packed, bases)} MB in "
+        f"{len(packed)} packed jobs",
+        file=sys.stderr,
+    )
+    return packed, packed_jobs
+
+
+def format_jobs(
+    matrix: str,
+    shards: Optional[int] = None,
+    max_jobs: Optional[int] = None,
+    timings: Optional[str] = None,
+    pack_by_base: bool = False,
 ) -> str:
     """
-    Get software (Poetry or Python) version for Dockerfile.
+    Format jobs matrix, packing its jobs into shards if requested.
+
+    If there are build durations, jobs are ordered longest first and their
+    predicted durations are printed to standard error.
 
     Parameters
     ----------
-    minor_version : str
-        Major and Minor version of software.
-    versions : Dict[str, List[int]]
-        Versions of the software.
+    matrix : str
+        Jobs matrix JSON, with the jobs in its include key.
+    shards : Optional[int], optional
+        Number of shards, by default None
+    max_jobs : Optional[int], optional
+        Maximum number of matrix jobs, by default None
+    timings : Optional[str], optional
+        Path of build durations file, by default .pipeline_cache/timings.jsonl
+        if it exists.
+    pack_by_base : bool, optional
+        Pack jobs sharing base Images into single jobs, by default False
 
     Returns
     -------
     str
-        Highest software version in format major.minor.patch.
+        Jobs matrix JSON.
+
+    Raises
+    ------
+    SystemExit
+        If shards or max_jobs are not positive, or timings file is invalid.
 
     """
-    return f"{minor_version}.{max(versions[minor_version])}"
+    if (shards is not None and shards < 1) or (
+        max_jobs is not None and max_jobs < 1
+    ):
+        print(
+            color_text(
+                "ERROR: --shards and --max-jobs must be positive.", "red"
+            )
+        )
+        raise SystemExit(1)
+    jobs = json.loads(matrix)["include"]
+    shard_count = get_shard_count(len(jobs), shards, max_jobs)
+    build_timings = load_timings(timings)
+    if shard_count is None and not build_timings and not pack_by_base:
+        return matrix
+    costs = get_job_costs(jobs, build_timings)
+    ordered: List[Dict[str, Any]]
+    if pack_by_base:
+        packed, ordered = pack_by_base_images(jobs, costs)
+    elif shard_count is None:
+        order = order_by_cost(costs)
+        packed = [[index] for index in order]
+        ordered = [jobs[index] for index in order]
+    else:
+        packed = pack_costs(costs, shard_count)
+        ordered = shard_jobs(jobs, packed)
+    if build_timings:
+        report_durations(packed, costs)
+    return json.dumps({"include": ordered})
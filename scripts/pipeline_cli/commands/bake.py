@@ -0,0 +1,52 @@
+"""Generate Docker Bake file command."""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from ..bake import get_bake_file
+from ..config import BAKE_CONTEXT_FOLDER
+from ..files import atomic_write
+from ..selector import Selector
+from .cd_jobs import get_cd_targets
+from .dockerfiles import load_templates, render_target
+
+
+def bake(
+    select: Optional[Selector] = None,
+    cd_only: bool = False,
+    output: Optional[str] = None,
+) -> None:
+    """
+    Generate Docker Bake file of project's Images.
+
+    A single docker buildx bake builds all Images, sharing base Image pulls
+    and common stages across Poetry versions. For example, write the file
+    with --output docker-bake.json and build it with docker buildx bake
+    --file docker-bake.json --push.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Images, by default None
+    cd_only : bool, optional
+        Only Images of the Continuos Delivery jobs, by default False
+    output : Optional[str], optional
+        Path to write Bake file, by default None (prints it)
+
+    """
+    templates = load_templates()
+    bake_file = get_bake_file(
+        (
+            get_cd_targets(select)
+            if cd_only
+            else list((select or Selector()).targets())
+        ),
+        lambda target: render_target(templates, target).decode("utf-8"),
+    )
+    BAKE_CONTEXT_FOLDER.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(bake_file, indent=2)
+    if not output:
+        return print(data)
+    atomic_write(Path(output), (data + "\n").encode("utf-8"))
+    return print(f"Bake file written to {output}")
@@ -1,35 +1,30 @@
 """Generate Continuous Delivery (CD) jobs command."""
 
 import json
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
+from cly.colors import color_text
+
+from ..buildcache import get_cache_key, get_cache_options
+from ..cache import cached
 from ..config import (
+    IMAGE_REPOSITORY,
     NEW_VERSIONS_FILE,
-    POETRY_VERSIONS,
-    PYTHON_VARIATIONS,
-    PYTHON_VERSIONS,
+    PUBLISHED_FILE,
+    REGISTRIES,
 )
-from . import get_dockerfile_version
-
-
-def get_newest_version(versions: Dict[str, List[int]]) -> str:
-    """
-    Get newest software (Poetry or Python) version.
-
-    Parameters
-    ----------
-    versions : Dict[str, List[int]]
-        Versions of the software.
-
-    Returns
-    -------
-    str
-        Newest software version in format major.minor.
-
-    """
-    versions_ = [(*version.split(".", maxsplit=1),) for version in versions]
-    newest_version = max(versions_)
-    return f"{newest_version[0]}.{newest_version[1]}"
+from ..fingerprint import (
+    Fingerprints,
+    get_changed_versions,
+    get_fingerprint,
+    read_fingerprints,
+    write_fingerprints,
+)
+from ..matrix import get_version_matrix, select_pairs
+from ..selector import Selector
+from ..targets import BuildTarget, iter_build_targets, parse_build_target
+from . import format_jobs
+from .dockerfiles import load_templates, render_target
 
 
 def get_tags(
@@ -61,55 +56,336 @@ def get_tags(
         Tags for image.
 
     """
-    tags = set()
-    for alias in PYTHON_VARIATIONS[variation]:
-        tags.add(
-            (
-                f"{poetry_minor}.{poetry_patch}-python"
-                f"{python_minor}.{python_patch}{alias}"
-            )
-        )
-        if python_patch == max(
-            PYTHON_VERSIONS[python_minor]
-        ) and poetry_patch == max(POETRY_VERSIONS[poetry_minor]):
-            tags.add((f"{poetry_minor}-python{python_minor}{alias}"))
-    latest_python = get_dockerfile_version(
-        get_newest_version(PYTHON_VERSIONS), PYTHON_VERSIONS
+    tags = get_version_matrix().tag_names(
+        poetry_minor, poetry_patch, python_minor, python_patch, variation
     )
-    latest_poetry = get_dockerfile_version(
-        get_newest_version(POETRY_VERSIONS), POETRY_VERSIONS
+    return " ".join(f"--tag {IMAGE_REPOSITORY}:{tag}" for tag in tags)
+
+
+def get_registry_tags(target: BuildTarget) -> Dict[str, List[str]]:
+    """
+    Get references of the tags of Image in each registry.
+
+    Parameters
+    ----------
+    target : BuildTarget
+        Build target of the Image.
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        Sorted tag references of the Image in each of REGISTRIES.
+
+    """
+    return {
+        registry: [f"{registry}:{tag}" for tag in target.tags]
+        for registry in REGISTRIES
+    }
+
+
+def get_job(target: BuildTarget) -> Dict[str, Any]:
+    """
+    Get Continuos Delivery job of build target.
+
+    The Image is built and pushed once, to the first of REGISTRIES; if there
+    are other registries, the job also has the tags of each registry, to
+    copy the Image to (see the mirror command).
+
+    Parameters
+    ----------
+    target : BuildTarget
+        Build target of the Image.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Version and tags of the Image.
+
+    """
+    job: Dict[str, Any] = {
+        "version": target.version,
+        "tags": get_tags(
+            poetry_minor=target.poetry_minor,
+            poetry_patch=target.poetry_patch,
+            python_minor=target.python_minor,
+            python_patch=target.python_patch,
+            variation=target.variation,
+        ),
+    }
+    if len(REGISTRIES) > 1:
+        job["registries"] = get_registry_tags(target)
+    return job
+
+
+def get_fingerprints(select: Optional[Selector] = None) -> Fingerprints:
+    """
+    Get fingerprints of project's Images.
+
+    The template of each Python variation is loaded once, and every Image
+    is rendered from it.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Images, by default all Images.
+
+    Returns
+    -------
+    Fingerprints
+        Version and fingerprint of the Image of each tag.
+
+    """
+    templates = load_templates()
+    fingerprints: Fingerprints = {}
+    for target in (select or Selector()).targets(patches=True):
+        image = {
+            "version": target.version,
+            "fingerprint": get_fingerprint(
+                render_target(templates, target).decode("utf-8")
+            ),
+        }
+        for tag in target.tags:
+            fingerprints[tag] = image
+    return fingerprints
+
+
+def iter_new_versions_targets(select: Selector) -> Iterator[BuildTarget]:
+    """
+    Iterate over build targets with a new Poetry or Python version.
+
+    Expands only the rows and columns of the versions matrix of each new
+    version.
+
+    Parameters
+    ----------
+    select : Selector
+        Selector of the Images.
+
+    Yields
+    ------
+    Iterator[BuildTarget]
+        Build targets, ordered by Poetry, Python and variation.
+
+    """
+    matrix = get_version_matrix()
+    new_versions_content = json.loads(NEW_VERSIONS_FILE.read_text())
+    new_poetry = set(
+        select_pairs(new_versions_content["Poetry"], matrix.poetry_index)
     )
-    if f"{latest_poetry}-python{latest_python}-bullseye" in tags:
-        tags.add("latest")
+    new_python = {
+        pair
+        for pair in select_pairs(
+            new_versions_content["Python"], matrix.python_index
+        )
+        if not select.python or select.python(*pair)
+    }
+
+    def poetry_filter(poetry_minor: str, poetry_patch: int) -> bool:
+        if not new_python and (poetry_minor, poetry_patch) not in new_poetry:
+            return False
+        return not select.poetry or select.poetry(poetry_minor, poetry_patch)
+
     return (
-        "--tag mateusoliveira43/poetry:"
-        + " --tag mateusoliveira43/poetry:".join(tags)
+        target
+        for target in iter_build_targets(
+            patches=True,
+            poetry=poetry_filter,
+            python=select.python,
+            variation=select.variation,
+            matrix=matrix,
+        )
+        if (target.poetry_minor, target.poetry_patch) in new_poetry
+        or (target.python_minor, target.python_patch) in new_python
     )
 
 
-def generate_cd_jobs() -> None:
-    """Generate jobs for the Continuos Delivery pipeline."""
-    new_versions_content = json.loads(NEW_VERSIONS_FILE.read_text())
-    jobs = [
-        {
-            "version": (
-                f"{poetry_minor}.{poetry_patch}-python"
-                f"{python_minor}.{python_patch}-{variation}"
-            ),
-            "tags": get_tags(
-                poetry_minor=poetry_minor,
-                poetry_patch=poetry_patch,
-                python_minor=python_minor,
-                python_patch=python_patch,
-                variation=variation,
-            ),
-        }
-        for poetry_minor, poetry_patches in POETRY_VERSIONS.items()
-        for poetry_patch in poetry_patches
-        for python_minor, python_patches in PYTHON_VERSIONS.items()
-        for python_patch in python_patches
-        for variation in PYTHON_VARIATIONS
-        if f"{poetry_minor}.{poetry_patch}" in new_versions_content["Poetry"]
-        or f"{python_minor}.{python_patch}" in new_versions_content["Python"]
-    ]
-    print(json.dumps({"include": jobs}))
+def iter_changed_targets(
+    published: Fingerprints, select: Selector
+) -> Iterator[BuildTarget]:
+    """
+    Iterate over build targets whose fingerprint changed since last publish.
+
+    Parameters
+    ----------
+    published : Fingerprints
+        Version and fingerprint of the Image of each published tag.
+    select : Selector
+        Selector of the Images.
+
+    Yields
+    ------
+    Iterator[BuildTarget]
+        Build targets, ordered by Poetry, Python and variation.
+
+    """
+    changed = get_changed_versions(get_fingerprints(select), published)
+    return (
+        target
+        for target in select.targets(patches=True)
+        if target.version in changed
+    )
+
+
+def get_cd_targets(select: Optional[Selector] = None) -> List[BuildTarget]:
+    """
+    Get build targets of the Continuos Delivery pipeline.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Images, by default all Images.
+
+    Returns
+    -------
+    List[BuildTarget]
+        Build targets of each Image to build.
+
+    """
+    select = select or Selector()
+    published = read_fingerprints(PUBLISHED_FILE)
+    return list(
+        iter_new_versions_targets(select)
+        if published is None
+        else iter_changed_targets(published, select)
+    )
+
+
+def get_cd_jobs(select: Optional[Selector] = None) -> List[Dict[str, Any]]:
+    """
+    Get jobs for the Continuos Delivery pipeline.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Images, by default all Images.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Version and tags of each Image to build.
+
+    """
+    return [get_job(target) for target in get_cd_targets(select)]
+
+
+def add_build_cache(matrix: str, cache: str, force_fresh: bool = False) -> str:
+    """
+    Add BuildKit cache options to each job of jobs matrix.
+
+    Images with the same Python version and variation share a build cache,
+    also keyed on the hash of the variation's template.
+
+    Parameters
+    ----------
+    matrix : str
+        Jobs matrix JSON, with the jobs in its include key.
+    cache : str
+        Type of the build cache, registry or local.
+    force_fresh : bool, optional
+        Build without reading the cache, only refreshing it, by default False
+
+    Returns
+    -------
+    str
+        Jobs matrix JSON, with cache-from and cache-to options in each job.
+
+    Raises
+    ------
+    SystemExit
+        If a template is invalid.
+
+    """
+    templates = load_templates()
+    jobs = json.loads(matrix)["include"]
+    for job in jobs:
+        target = parse_build_target(job["version"])
+        job.update(
+            get_cache_options(
+                get_cache_key(
+                    target.python_version,
+                    target.variation,
+                    templates[target.variation].digest,
+                ),
+                cache,
+                force_fresh,
+            )
+        )
+    return json.dumps({"include": jobs})
+
+
+# pylint: disable=too-many-arguments
+def generate_cd_jobs(
+    record: bool = False,
+    select: Optional[Selector] = None,
+    shards: Optional[int] = None,
+    max_jobs: Optional[int] = None,
+    timings: Optional[str] = None,
+    pack_by_base: bool = False,
+    cache: Optional[str] = None,
+    force_fresh: bool = False,
+) -> None:
+    """
+    Generate jobs for the Continuos Delivery pipeline.
+
+    If there is a manifest of the published Images fingerprints (the hash of
+    the rendered Dockerfile), only Images whose fingerprint changed are
+    built; else, only Images with a new Poetry or Python version are built.
+
+    Jobs are cached until the project's config, templates, new versions or
+    published fingerprints change. If shards or max_jobs are passed, jobs
+    are packed into shard jobs of balanced cost, each with the list of jobs
+    to run in sequence. If pack_by_base is passed, jobs sharing base Images
+    are packed into single jobs instead.
+
+    If cache is passed, each job gets docker buildx build options to import
+    (cache-from) and export (cache-to) a build cache, keyed on the Python
+    base, variation and template hash; with force_fresh, the cache is only
+    exported, for periodic clean builds.
+
+    Parameters
+    ----------
+    record : bool, optional
+        Record fingerprints of all project's Images as published, instead of
+        generating jobs, by default False
+    select : Optional[Selector], optional
+        Selector of the Images, by default None
+    shards : Optional[int], optional
+        Number of shard jobs to pack jobs into, by default None
+    max_jobs : Optional[int], optional
+        Pack jobs into shards only above this many jobs, by default None
+    timings : Optional[str], optional
+        Build durations file to weight jobs with, by default the recorded
+        durations, if any.
+    pack_by_base : bool, optional
+        Pack jobs sharing base Images into single jobs, by default False
+    cache : Optional[str], optional
+        Build cache type (registry or local) of jobs, by default None
+    force_fresh : bool, optional
+        Build without reading the build cache, by default False
+
+    Raises
+    ------
+    SystemExit
+        If force_fresh is passed without cache.
+
+    """
+    if force_fresh and not cache:
+        print(color_text("ERROR: --force-fresh requires --cache.", "red"))
+        raise SystemExit(1)
+    if record:
+        write_fingerprints(PUBLISHED_FILE, get_fingerprints())
+        return print(f"Fingerprints recorded in {PUBLISHED_FILE}")
+    matrix = cached(
+        "cd", lambda: json.dumps({"include": get_cd_jobs(select)}), select
+    )
+    if cache:
+        matrix = add_build_cache(matrix, cache, force_fresh)
+    return print(
+        format_jobs(
+            matrix,
+            shards=shards,
+            max_jobs=max_jobs,
+            timings=timings,
+            pack_by_base=pack_by_base,
+        )
+    )
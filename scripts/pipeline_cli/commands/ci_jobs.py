@@ -1,27 +1,75 @@
 """Generate Continuous Integration (CI) jobs command."""
 
 import json
+from typing import Dict, List, Optional
 
-from ..config import POETRY_VERSIONS, PYTHON_VARIATIONS, PYTHON_VERSIONS
-from . import get_dockerfile_version
-
-jobs = [
-    {
-        "dockerfile": (
-            f"{poetry_minor}/python{python_minor}-{variation}/Dockerfile"
-        ),
-        "version": (
-            f"{get_dockerfile_version(poetry_minor, POETRY_VERSIONS)}-python"
-            f"{get_dockerfile_version(python_minor, PYTHON_VERSIONS)}-"
-            f"{variation}"
-        ),
-    }
-    for poetry_minor in POETRY_VERSIONS
-    for python_minor in PYTHON_VERSIONS
-    for variation in PYTHON_VARIATIONS
-]
-
-
-def generate_ci_jobs() -> None:
-    """Generate jobs for the Continuos Integration pipeline."""
-    print(json.dumps({"include": jobs}))
+from ..cache import cached
+from ..selector import Selector
+from . import format_jobs
+
+
+def get_ci_jobs(select: Optional[Selector] = None) -> List[Dict[str, str]]:
+    """
+    Get jobs for the Continuos Integration pipeline.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Images, by default all Images.
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Dockerfile path and version of each project's Image.
+
+    """
+    return [
+        {"dockerfile": target.dockerfile, "version": target.version}
+        for target in (select or Selector()).targets()
+    ]
+
+
+def generate_ci_jobs(
+    select: Optional[Selector] = None,
+    shards: Optional[int] = None,
+    max_jobs: Optional[int] = None,
+    timings: Optional[str] = None,
+    pack_by_base: bool = False,
+) -> None:
+    """
+    Generate jobs for the Continuos Integration pipeline.
+
+    Jobs are cached until project's config, templates or new versions change.
+    If shards or max_jobs are passed, jobs are packed into shard jobs of
+    balanced cost, each with the list of jobs to run in sequence. If
+    pack_by_base is passed, jobs sharing base Images are packed into single
+    jobs instead.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Images, by default None
+    shards : Optional[int], optional
+        Number of shard jobs to pack jobs into, by default None
+    max_jobs : Optional[int], optional
+        Pack jobs into shards only above this many jobs, by default None
+    timings : Optional[str], optional
+        Build durations file to weight jobs with, by default the recorded
+        durations, if any.
+    pack_by_base : bool, optional
+        Pack jobs sharing base Images into single jobs, by default False
+
+    """
+    print(
+        format_jobs(
+            cached(
+                "ci",
+                lambda: json.dumps({"include": get_ci_jobs(select)}),
+                select,
+            ),
+            shards=shards,
+            max_jobs=max_jobs,
+            timings=timings,
+            pack_by_base=pack_by_base,
+        )
+    )
@@ -1,35 +1,235 @@
 """Write and print Dockerfiles command."""
 
-import shutil
+import difflib
+import importlib
+import io
+import json
+import sys
+import tarfile
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple, Union
 
+from cly.colors import color_text
+
+from .. import config
+from ..cache import cached
 from ..config import (
-    POETRY_VERSIONS,
+    DOCKERFILES_MANIFEST_FILE,
+    FRAGMENT_FOLDER,
     PROJECT_ROOT,
-    PYTHON_VARIATIONS,
-    PYTHON_VERSIONS,
     TEMPLATE_FOLDER,
 )
-from . import get_dockerfile_version
+from ..files import atomic_write, get_hash
+from ..matrix import get_version_matrix
+from ..selector import Selector
+from ..shards import unshard_jobs
+from ..targets import BuildTarget
+from ..template import (
+    CompiledTemplate,
+    TemplateError,
+    get_template_path,
+    invalidate_template,
+    load_template,
+    render_dockerfile,
+)
+from ..watch import create_watcher
+
+CONFIG_FILE = Path(config.__file__).resolve()
+
+ManifestEntry = Dict[str, Union[str, int]]
+Manifest = Dict[str, ManifestEntry]
+
+
+def read_manifest() -> Manifest:
+    """
+    Read manifest of generated Dockerfiles.
+
+    Returns
+    -------
+    Manifest
+        Template hash, Dockerfile hash and Dockerfile stat of each generated
+        Dockerfile folder; empty if there is no valid manifest.
+
+    """
+    try:
+        manifest: Manifest = json.loads(DOCKERFILES_MANIFEST_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    return manifest
+
+
+def write_manifest(manifest: Manifest) -> None:
+    """
+    Write manifest of generated Dockerfiles.
+
+    Parameters
+    ----------
+    manifest : Manifest
+        Template hash, Dockerfile hash and Dockerfile stat of each generated
+        Dockerfile folder.
+
+    """
+    DOCKERFILES_MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(
+        DOCKERFILES_MANIFEST_FILE,
+        (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode(),
+    )
 
 
-def get_dockerfile_data(
+def is_up_to_date(
     dockerfile_path: Path,
-    python_version: str,
-    poetry_version: str,
-) -> str:
+    entry: Optional[ManifestEntry],
+    template_hash: str,
+    dockerfile_hash: str,
+) -> bool:
     """
-    Get Dockerfile data given path to template and Python and Poetry versions.
+    Check, using the manifest, if Dockerfile on disk is already rendered.
+
+    The Dockerfile is only read if its manifest entry is missing, outdated or
+    its stat changed since it was last generated.
 
     Parameters
     ----------
     dockerfile_path : Path
-        Path for Dockerfile template.
-    python_version : str
-        Python version.
-    poetry_version : str
-        Poetry version.
+        Path of the Dockerfile.
+    entry : Optional[ManifestEntry]
+        Manifest entry of the Dockerfile folder.
+    template_hash : str
+        Hash of the Dockerfile template.
+    dockerfile_hash : str
+        Hash of the rendered Dockerfile.
+
+    Returns
+    -------
+    bool
+        True if Dockerfile on disk has the rendered content; False otherwise.
+
+    """
+    try:
+        stat = dockerfile_path.stat()
+    except OSError:
+        return False
+    if (
+        entry
+        and entry["template"] == template_hash
+        and entry["dockerfile"] == dockerfile_hash
+        and entry["mtime"] == stat.st_mtime_ns
+        and entry["size"] == stat.st_size
+    ):
+        return True
+    return get_hash(dockerfile_path.read_bytes()) == dockerfile_hash
+
+
+def write_dockerfile(
+    folder: str,
+    dockerfile_data: bytes,
+    template_hash: str,
+    entry: Optional[ManifestEntry],
+) -> Tuple[ManifestEntry, bool]:
+    """
+    Write Dockerfile to folder, if its content changed.
+
+    Parameters
+    ----------
+    folder : str
+        Dockerfile folder, relative to project root.
+    dockerfile_data : bytes
+        Rendered Dockerfile.
+    template_hash : str
+        Hash of the Dockerfile template.
+    entry : Optional[ManifestEntry]
+        Manifest entry of the Dockerfile folder.
+
+    Returns
+    -------
+    Tuple[ManifestEntry, bool]
+        New manifest entry of the Dockerfile folder and True if the Dockerfile
+        was written; False otherwise.
+
+    """
+    dockerfile_path = PROJECT_ROOT / folder / "Dockerfile"
+    dockerfile_hash = get_hash(dockerfile_data)
+    written = not is_up_to_date(
+        dockerfile_path, entry, template_hash, dockerfile_hash
+    )
+    if written:
+        dockerfile_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(dockerfile_path, dockerfile_data)
+    stat = dockerfile_path.stat()
+    return {
+        "template": template_hash,
+        "dockerfile": dockerfile_hash,
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }, written
+
+
+def load_templates() -> Dict[str, CompiledTemplate]:
+    """
+    Load compiled templates of all Python variations.
+
+    Returns
+    -------
+    Dict[str, CompiledTemplate]
+        Compiled template of each Python variation.
+
+    Raises
+    ------
+    SystemExit
+        If a template is invalid.
+
+    """
+    try:
+        return {
+            variation: load_template(variation)
+            for variation in get_version_matrix().variations
+        }
+    except TemplateError as error:
+        print(color_text(f"ERROR: {error}", "red"))
+        raise SystemExit(1) from error
+
+
+def render_target(
+    templates: Dict[str, CompiledTemplate], target: BuildTarget
+) -> bytes:
+    """
+    Render Dockerfile of target.
+
+    Parameters
+    ----------
+    templates : Dict[str, CompiledTemplate]
+        Compiled template of each Python variation.
+    target : BuildTarget
+        Build target of the Dockerfile.
+
+    Returns
+    -------
+    bytes
+        Rendered Dockerfile.
+
+    """
+    return (
+        templates[target.variation]
+        .render(
+            {
+                "PYTHON_VERSION": target.python_version,
+                "POETRY_VERSION": target.poetry_version,
+            }
+        )
+        .encode("utf-8")
+    )
+
+
+def render_version(version: str) -> str:
+    """
+    Render Dockerfile of Image version.
+
+    Parameters
+    ----------
+    version : str
+        Full version of the Image, in format
+        POETRY_VERSION-pythonPYTHON_VERSION-PYTHON_VARIATION.
 
     Returns
     -------
@@ -37,28 +237,325 @@ def get_dockerfile_data(
         Dockerfile file data.
 
     """
-    with open(dockerfile_path, mode="r", encoding="utf-8") as file:
-        final_data = (
-            file.read()
-            .replace(
-                "{{PYTHON_VERSION}}",
-                python_version,
-            )
-            .replace(
-                "{{POETRY_VERSION}}",
-                poetry_version,
+    poetry_version, python_version, variation = version.split("-", maxsplit=2)
+    return render_dockerfile(
+        variation=variation,
+        python_version=python_version.replace("python", ""),
+        poetry_version=poetry_version,
+    )
+
+
+def write_rendered_dockerfiles(versions: List[str], folder: Path) -> None:
+    """
+    Write rendered Dockerfile of each Image version to folder.
+
+    Each Dockerfile is named after its version, for example
+    1.1.15-python3.10.7-bullseye.Dockerfile.
+
+    Parameters
+    ----------
+    versions : List[str]
+        Full versions of the Images.
+    folder : Path
+        Folder to write Dockerfiles.
+
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    for version in versions:
+        atomic_write(
+            folder / f"{version}.Dockerfile",
+            render_version(version).encode("utf-8"),
+        )
+
+
+def write_rendered_tar(versions: List[str], stream: BinaryIO) -> None:
+    """
+    Write rendered Dockerfile of each Image version as a tar stream.
+
+    Each Dockerfile is named after its version, for example
+    1.1.15-python3.10.7-bullseye.Dockerfile.
+
+    Parameters
+    ----------
+    versions : List[str]
+        Full versions of the Images.
+    stream : BinaryIO
+        Stream to write tar archive.
+
+    """
+    with tarfile.open(fileobj=stream, mode="w|") as archive:
+        for version in versions:
+            data = render_version(version).encode("utf-8")
+            info = tarfile.TarInfo(f"{version}.Dockerfile")
+            info.size = len(data)
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(data))
+
+
+def render_matrix(matrix_file: str, out: str) -> None:
+    """
+    Render Dockerfile of each job of a Continuous Delivery jobs matrix.
+
+    Jobs of shard jobs are rendered too.
+
+    Parameters
+    ----------
+    matrix_file : str
+        Path of the jobs matrix JSON file, or - to read it from standard
+        input.
+    out : str
+        Folder to write Dockerfiles, or - to write them as a tar stream to
+        standard output.
+
+    """
+    if matrix_file == "-":
+        jobs_matrix = json.load(sys.stdin)
+    else:
+        jobs_matrix = json.loads(Path(matrix_file).read_text(encoding="utf-8"))
+    versions = [job["version"] for job in unshard_jobs(jobs_matrix["include"])]
+    if out == "-":
+        # pylint infers sys.stdout from a replaced capture stream
+        stream = sys.stdout.buffer  # pylint: disable=no-member
+        write_rendered_tar(versions, stream)
+        stream.flush()
+    else:
+        write_rendered_dockerfiles(versions, Path(out))
+
+
+def write_dockerfiles(
+    templates: Dict[str, CompiledTemplate],
+    select: Optional[Selector] = None,
+) -> Tuple[int, int]:
+    """
+    Write project's Dockerfiles whose content changed.
+
+    Parameters
+    ----------
+    templates : Dict[str, CompiledTemplate]
+        Compiled template of each Python variation.
+    select : Optional[Selector], optional
+        Selector of the Dockerfiles, by default all Dockerfiles.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Number of written Dockerfiles and of selected Dockerfiles.
+
+    """
+    old_manifest = read_manifest()
+    targets = list((select or Selector()).targets())
+    results = [
+        write_dockerfile(
+            folder=target.folder,
+            dockerfile_data=render_target(templates, target),
+            template_hash=templates[target.variation].digest,
+            entry=old_manifest.get(target.folder),
+        )
+        for target in targets
+    ]
+
+    manifest: Manifest = dict(old_manifest) if select else {}
+    manifest.update(
+        (target.folder, entry) for target, (entry, _) in zip(targets, results)
+    )
+    if manifest != old_manifest:
+        write_manifest(manifest)
+    return sum(written for _, written in results), len(targets)
+
+
+def get_affected_variations(
+    changed: Set[Path], templates: Dict[str, CompiledTemplate]
+) -> Optional[Set[str]]:
+    """
+    Get Python variations affected by changed files.
+
+    Parameters
+    ----------
+    changed : Set[Path]
+        Paths of the changed files.
+    templates : Dict[str, CompiledTemplate]
+        Compiled template of each Python variation.
+
+    Returns
+    -------
+    Optional[Set[str]]
+        Python variations whose template or fragments changed; None, if
+        pipeline config changed, affecting all Dockerfiles.
+
+    """
+    if CONFIG_FILE in changed:
+        return None
+    variations = {
+        variation
+        for variation, template in templates.items()
+        if changed.intersection(template.files)
+    }
+    variations.update(
+        variation
+        for variation in get_version_matrix().variations
+        if get_template_path(variation) in changed
+    )
+    return variations
+
+
+def regenerate_dockerfiles(
+    changed: Set[Path], templates: Dict[str, CompiledTemplate]
+) -> None:
+    """
+    Regenerate Dockerfiles affected by changed files.
+
+    Parameters
+    ----------
+    changed : Set[Path]
+        Paths of the changed files.
+    templates : Dict[str, CompiledTemplate]
+        Compiled template of each Python variation, updated in place.
+
+    """
+    variations = get_affected_variations(changed, templates)
+    if variations is None:
+        importlib.reload(config)
+        get_version_matrix.cache_clear()
+        variations = set(get_version_matrix().variations)
+        templates.clear()
+    if not variations:
+        return
+    for path in changed:
+        invalidate_template(path)
+    for variation in variations:
+        templates[variation] = load_template(variation)
+    written, total = write_dockerfiles(
+        templates, Selector(variation=variations.__contains__)
+    )
+    names = ", ".join(sorted(variations))
+    print(f"Regenerated {names} Dockerfiles ({written} of {total} updated)")
+
+
+def watch_dockerfiles() -> None:
+    """
+    Regenerate Dockerfiles whenever templates or pipeline config change.
+
+    Compiled templates and the versions matrix are kept in memory, and only
+    Dockerfiles affected by the changed file are rendered again.
+
+    """
+    templates = load_templates()
+    written, total = write_dockerfiles(templates)
+    print(f"Dockerfiles generated ({written} of {total} updated)")
+    folders = [TEMPLATE_FOLDER, FRAGMENT_FOLDER, CONFIG_FILE.parent]
+    watcher = create_watcher([folder for folder in folders if folder.is_dir()])
+    print(
+        f"Watching templates and {CONFIG_FILE.name} with "
+        f"{type(watcher).__name__}. Press CTRL+C to stop."
+    )
+    try:
+        while True:
+            changed = watcher.wait()
+            try:
+                regenerate_dockerfiles(changed, templates)
+            except (TemplateError, SyntaxError, ValueError) as error:
+                print(color_text(f"ERROR: {error}", "red"))
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    finally:
+        watcher.close()
+
+
+def get_stale_dockerfiles(
+    select: Optional[Selector] = None,
+) -> Dict[str, Tuple[bytes, bytes]]:
+    """
+    Get project's Dockerfiles that differ from their rendered content.
+
+    Nothing is written; every Dockerfile is rendered in memory and compared
+    with the one on disk.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Dockerfiles, by default all Dockerfiles.
+
+    Returns
+    -------
+    Dict[str, Tuple[bytes, bytes]]
+        Current and rendered content of each missing or outdated Dockerfile,
+        by folder relative to project root.
+
+    """
+    templates = load_templates()
+    stale = {}
+    for target in (select or Selector()).targets():
+        dockerfile_path = PROJECT_ROOT / target.dockerfile
+        try:
+            current = dockerfile_path.read_bytes()
+        except OSError:
+            current = b""
+        rendered = render_target(templates, target)
+        if current != rendered:
+            stale[target.folder] = (current, rendered)
+    return stale
+
+
+def check_dockerfiles(select: Optional[Selector] = None) -> None:
+    """
+    Check if project's Dockerfiles are up to date, without writing them.
+
+    Parameters
+    ----------
+    select : Optional[Selector], optional
+        Selector of the Dockerfiles, by default all Dockerfiles.
+
+    Raises
+    ------
+    SystemExit
+        If a Dockerfile is missing or outdated, after printing its diff.
+
+    """
+    stale = get_stale_dockerfiles(select)
+    if not stale:
+        print(color_text("Dockerfiles are up to date.", "green"))
+        return
+    for folder, (current, rendered) in stale.items():
+        dockerfile = f"{folder}/Dockerfile"
+        if not current:
+            print(f"{dockerfile} is missing")
+            continue
+        sys.stdout.writelines(
+            difflib.unified_diff(
+                current.decode("utf-8").splitlines(keepends=True),
+                rendered.decode("utf-8").splitlines(keepends=True),
+                fromfile=dockerfile,
+                tofile=f"{dockerfile} (rendered)",
+                n=0,
             )
         )
-    return final_data
+    print(
+        color_text(
+            f"ERROR: {len(stale)} Dockerfiles are outdated. Run "
+            "./scripts/pipeline.py dockerfiles to generate them.",
+            "red",
+        )
+    )
+    raise SystemExit(1)
 
 
-def generate_dockerfiles(version: Optional[str] = None) -> None:
+# pylint: disable=too-many-arguments
+def generate_dockerfiles(
+    version: Optional[str] = None,
+    check: bool = False,
+    from_matrix: Optional[str] = None,
+    out: Optional[str] = None,
+    select: Optional[Selector] = None,
+    watch: bool = False,
+) -> None:
     """
     Generate Dockerfiles for version control or Continuous Delivery job.
 
     If no version is passed, writes all project's Dockerfiles, tracked by
-    version control. If version is passed, prints the Dockerfile for that
-    specific version. Version must follow project format:
+    version control. Only Dockerfiles whose content changed are written,
+    atomically. If version is passed, prints the Dockerfile for that specific
+    version, cached until project's templates change. Version must follow
+    project format:
 
     POETRY_VERSION-pythonPYTHON_VERSION-PYTHON_VARIATION
 
@@ -68,45 +565,39 @@ def generate_dockerfiles(version: Optional[str] = None) -> None:
     ----------
     version : Optional[str], optional
         Full version of the Image, by default None
+    check : bool, optional
+        Only check if Dockerfiles are up to date, by default False
+    from_matrix : Optional[str], optional
+        CD jobs matrix file (- for stdin) to render, by default None
+    out : Optional[str], optional
+        Folder (- for tar stream in stdout) of rendered matrix, by default None
+    select : Optional[Selector], optional
+        Selector of the Dockerfiles to write or check, by default None
+    watch : bool, optional
+        Regenerate Dockerfiles when templates or config change, by default
+        False
+
+    Raises
+    ------
+    SystemExit
+        If from_matrix is passed without out.
 
     """
     if version:
-        poetry_version, python_version, variation = version.split(
-            "-", maxsplit=2
-        )
         return print(
-            get_dockerfile_data(
-                dockerfile_path=TEMPLATE_FOLDER
-                / f"Dockerfile-{variation}.template",
-                python_version=python_version.replace("python", ""),
-                poetry_version=poetry_version,
-            )
+            cached(f"dockerfile:{version}", partial(render_version, version))
         )
+    if from_matrix:
+        if not out:
+            print(color_text("ERROR: --from-matrix requires --out.", "red"))
+            raise SystemExit(1)
+        return render_matrix(from_matrix, out)
+    if check:
+        return check_dockerfiles(select)
+    if watch:
+        return watch_dockerfiles()
     print("Generating Dockerfiles...")
-    for poetry_minor in POETRY_VERSIONS:
-        for python_minor in PYTHON_VERSIONS:
-            for variation in PYTHON_VARIATIONS:
-                folder = f"{poetry_minor}/python{python_minor}-{variation}"
-                folder_path = PROJECT_ROOT / folder
-                folder_path.mkdir(parents=True, exist_ok=True)
-                dockerfile_path = folder_path / "Dockerfile"
-
-                shutil.copyfile(
-                    TEMPLATE_FOLDER / f"Dockerfile-{variation}.template",
-                    dockerfile_path,
-                )
-
-                dockerfile_data = get_dockerfile_data(
-                    dockerfile_path=dockerfile_path,
-                    python_version=get_dockerfile_version(
-                        python_minor, PYTHON_VERSIONS
-                    ),
-                    poetry_version=get_dockerfile_version(
-                        poetry_minor, POETRY_VERSIONS
-                    ),
-                )
-
-                with open(dockerfile_path, mode="w", encoding="utf-8") as file:
-                    file.write(dockerfile_data)
-
-    return print("Dockerfiles generated successfully!")
+    written, total = write_dockerfiles(load_templates(), select)
+    return print(
+        f"Dockerfiles generated successfully! ({written} of {total} updated)"
+    )
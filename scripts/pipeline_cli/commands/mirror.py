@@ -0,0 +1,101 @@
+"""Copy Docker Images to mirror registries command."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from cly.colors import color_text
+
+from ..config import IMAGE_REPOSITORY, REGISTRIES
+from ..http_client import HTTPClient, HTTPError
+from ..registry import copy_image as copy_registry_image
+from ..registry import parse_repository
+from ..selector import Selector
+from ..targets import BuildTarget, parse_build_target
+from .cd_jobs import get_cd_targets
+
+
+def copy_image(target: BuildTarget, registry: str) -> None:
+    """
+    Copy Image from the first of REGISTRIES to registry.
+
+    Each copy has its own HTTP client, as clients are not shared between
+    threads.
+
+    Parameters
+    ----------
+    target : BuildTarget
+        Build target of the Image.
+    registry : str
+        Docker repository to copy the Image to.
+
+    """
+    client = HTTPClient()
+    try:
+        copy_registry_image(
+            client,
+            parse_repository(IMAGE_REPOSITORY),
+            target.version,
+            parse_repository(registry),
+            target.tags,
+        )
+    finally:
+        client.close()
+    print(f"Copied {target.version} to {registry}")
+
+
+def mirror(
+    versions: Optional[List[str]] = None,
+    jobs: int = 4,
+    select: Optional[Selector] = None,
+) -> None:
+    """
+    Copy published Images to the other registries, without rebuilding them.
+
+    Images are built and pushed once, to the first of REGISTRIES, and are
+    then copied concurrently to each other registry through the registry
+    API, with the credentials stored by docker login. Blobs are mounted
+    between repositories of the same registry. If no versions are passed,
+    copies the Images of the Continuos Delivery jobs.
+
+    Parameters
+    ----------
+    versions : Optional[List[str]], optional
+        Full versions of the Images, by default None
+    jobs : int, optional
+        Number of concurrent copies, by default 4
+    select : Optional[Selector], optional
+        Selector of the Images, by default None
+
+    Raises
+    ------
+    SystemExit
+        If a version is not in the versions matrix, or a copy fails.
+
+    """
+    targets: List[BuildTarget]
+    if versions:
+        try:
+            targets = [parse_build_target(version) for version in versions]
+        except ValueError as error:
+            print(color_text(f"ERROR: {error}", "red"))
+            raise SystemExit(1) from error
+    else:
+        targets = get_cd_targets(select)
+    copies = [
+        (target, registry) for target in targets for registry in REGISTRIES[1:]
+    ]
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        futures = [
+            executor.submit(copy_image, target, registry)
+            for target, registry in copies
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except (HTTPError, OSError) as error:
+            print(color_text(f"ERROR: {error}", "red"))
+            raise SystemExit(1) from error
+    print(
+        f"Copied {len(targets)} Images to {len(REGISTRIES) - 1} registries "
+        f"({len(copies)} copies)."
+    )
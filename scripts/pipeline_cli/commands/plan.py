@@ -0,0 +1,102 @@
+"""Plan Continuous Integration and Delivery pipelines command."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from cly.colors import color_text
+
+from ..cache import cached
+from ..shards import unshard_jobs
+from . import format_jobs
+from .cd_jobs import add_build_cache, get_cd_jobs
+from .ci_jobs import get_ci_jobs
+from .dockerfiles import get_stale_dockerfiles, write_rendered_dockerfiles
+
+
+def write_github_output(outputs: Dict[str, str]) -> None:
+    """
+    Write outputs as key=value lines to GitHub Actions output file.
+
+    If the GITHUB_OUTPUT environment variable is not set, lines are printed.
+
+    Parameters
+    ----------
+    outputs : Dict[str, str]
+        Single line value of each output.
+
+    """
+    lines = "".join(f"{key}={value}\n" for key, value in outputs.items())
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if not github_output:
+        print(lines, end="")
+        return
+    with open(github_output, mode="a", encoding="utf-8") as file:
+        file.write(lines)
+
+
+def plan(
+    output: Optional[str] = None,
+    render: bool = False,
+    max_jobs: Optional[int] = None,
+    cache: Optional[str] = None,
+) -> None:
+    """
+    Plan Continuous Integration and Delivery pipelines in a single run.
+
+    Computes the CI and CD jobs and checks if project's Dockerfiles are up to
+    date. If output is passed, writes ci.json, cd.json and dockerfiles.json
+    to that folder (and the rendered Dockerfile of each CD job to its
+    dockerfiles folder, if render is passed); else, writes them as key=value
+    lines to GitHub Actions output file (or prints them, outside of GitHub
+    Actions). CI and CD jobs are shared with the ci and cd commands through
+    the plan cache. If max_jobs is passed, CD jobs above that many are
+    packed into at most max_jobs shard jobs, as by cd --max-jobs. If cache
+    is passed, CD jobs get build cache options, as by cd --cache.
+
+    Parameters
+    ----------
+    output : Optional[str], optional
+        Folder to write plan files, by default None
+    render : bool, optional
+        Also write Dockerfiles of CD jobs to output folder, by default False
+    max_jobs : Optional[int], optional
+        Maximum number of CD matrix jobs, by default None
+    cache : Optional[str], optional
+        Build cache type (registry or local) of CD jobs, by default None
+
+    Raises
+    ------
+    SystemExit
+        If render is passed without output.
+
+    """
+    if render and not output:
+        print(color_text("ERROR: --render requires --output.", "red"))
+        raise SystemExit(1)
+    cd_matrix = cached("cd", lambda: json.dumps({"include": get_cd_jobs()}))
+    if cache:
+        cd_matrix = add_build_cache(cd_matrix, cache)
+    cd_output = format_jobs(cd_matrix, max_jobs=max_jobs)
+    stale = list(get_stale_dockerfiles())
+    outputs = {
+        "ci": cached("ci", lambda: json.dumps({"include": get_ci_jobs()})),
+        "cd": cd_output,
+        "dockerfiles": json.dumps({"up_to_date": not stale, "stale": stale}),
+    }
+    if not output:
+        return write_github_output(outputs)
+    output_folder = Path(output)
+    output_folder.mkdir(parents=True, exist_ok=True)
+    for name, value in outputs.items():
+        (output_folder / f"{name}.json").write_text(value + "\n")
+    if render:
+        write_rendered_dockerfiles(
+            [
+                job["version"]
+                for job in unshard_jobs(json.loads(cd_output)["include"])
+            ],
+            output_folder / "dockerfiles",
+        )
+    return None
@@ -0,0 +1,67 @@
+"""Retag published Docker Images command."""
+
+import json
+from typing import Optional
+
+from cly.colors import color_text
+
+from ..config import PUBLISHED_FILE, REGISTRIES
+from ..fingerprint import get_retags, read_fingerprints
+from ..http_client import HTTPClient, HTTPError
+from ..registry import copy_tags, parse_repository
+from .cd_jobs import get_fingerprints
+
+
+def retag(apply: bool = False, repository: Optional[str] = None) -> None:
+    """
+    Plan copies of published Images to tags that moved to them.
+
+    When only a tag moves (for example, latest or a Major and Minor tag
+    moving to a published patch), its Image is not rebuilt by the cd
+    command; the tag is copied from a published tag of that Image, in each
+    of REGISTRIES. Prints one job per source Image, with source and tags to
+    add; needs the published fingerprints manifest.
+
+    With apply, the tags are copied through the registry API: the source
+    manifest is got once and put under each tag, so no layer is pulled or
+    pushed. Registries are authenticated with the credentials stored by
+    docker login.
+
+    Parameters
+    ----------
+    apply : bool, optional
+        Copy the tags in the registries, by default False
+    repository : Optional[str], optional
+        Docker repository of the Images, by default all REGISTRIES
+
+    Raises
+    ------
+    SystemExit
+        If a registry request fails.
+
+    """
+    published = read_fingerprints(PUBLISHED_FILE)
+    retags = get_retags(get_fingerprints(), published) if published else {}
+    registries = [repository] if repository else REGISTRIES
+    jobs = [
+        {
+            "source": f"{registry}:{source}",
+            "tags": " ".join(f"--tag {registry}:{tag}" for tag in tags),
+        }
+        for registry in registries
+        for source, tags in retags.items()
+    ]
+    if not apply:
+        return print(json.dumps({"include": jobs}))
+    client = HTTPClient()
+    try:
+        for registry in registries:
+            for source, tags in retags.items():
+                copy_tags(client, parse_repository(registry), source, tags)
+                print(f"Copied {registry}:{source}: {', '.join(tags)}")
+    except (HTTPError, OSError) as error:
+        print(color_text(f"ERROR: {error}", "red"))
+        raise SystemExit(1) from error
+    finally:
+        client.close()
+    return print(f"Retagged {len(jobs)} published Images.")
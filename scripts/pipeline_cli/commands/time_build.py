@@ -0,0 +1,53 @@
+"""Time Docker Image build command."""
+
+import shlex
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from cly.colors import color_text
+from cly.utils import run_command
+
+from ..config import TIMINGS_FILE
+from ..timings import record_timing
+
+
+def time_build(
+    version: str, build_command: List[str], timings: Optional[str] = None
+) -> None:
+    """
+    Run build command of Image and record how long it took.
+
+    The duration is appended to the build durations file only if the build
+    succeeds. For example:
+
+    pipeline.py time-build -v 1.5.1-python3.11.4-bullseye -- docker build .
+
+    Parameters
+    ----------
+    version : str
+        Full version of the Image being built.
+    build_command : List[str]
+        Command that builds the Image, with its arguments.
+    timings : Optional[str], optional
+        Build durations file, by default .pipeline_cache/timings.jsonl
+
+    Raises
+    ------
+    SystemExit
+        If no build command is passed, or it fails.
+
+    """
+    if build_command[:1] == ["--"]:
+        build_command = build_command[1:]
+    if not build_command:
+        print(color_text("ERROR: missing build command.", "red"))
+        raise SystemExit(1)
+    start = time.monotonic()
+    # run_command joins its arguments into a shell command line, so they are
+    # quoted to keep arguments with spaces (like sh -c scripts) whole
+    run_command([" ".join(map(shlex.quote, build_command))])
+    seconds = time.monotonic() - start
+    path = Path(timings) if timings else TIMINGS_FILE
+    record_timing(path, version, seconds)
+    print(f"Build of {version} took {seconds:.1f}s, recorded in {path}")
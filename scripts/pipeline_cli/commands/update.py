@@ -3,8 +3,7 @@
 import json
 from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
-from urllib import request
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 from cly.colors import color_text
 from cly.utils import run_command
@@ -14,59 +13,55 @@ from ..config import (
     POETRY_VERSIONS,
     PROJECT_ROOT,
     PYTHON_VERSIONS,
+    UPDATE_CACHE_FILES,
     __file__,
 )
+from ..github import iter_github_tags
+from ..http_client import HTTPClient
+from ..registry import iter_registry_tags
+from ..update_cache import UpdateCache
+from ..versions import VersionIndex, get_oldest_version, parse_release
 
 TAB = " " * 4
+DOCKER_AUTH_URL = (
+    "https://auth.docker.io/token"
+    "?service=registry.docker.io&scope=repository:library/python:pull"
+)
 
 
-def tag_str_to_tuple(version: str) -> Tuple[int, int]:
-    """
-    Convert tag string to tuple of integers.
-
-    Parameters
-    ----------
-    version : str
-        Major and Minor versions of the software.
-
-    Returns
-    -------
-    Tuple[int, int]
-        Major and Minor versions converted.
-
-    """
-    return tuple(map(int, version.split(".", maxsplit=1)))  # type: ignore
-
-
-def patch_is_highest(patch: int, patches: List[int]) -> bool:
+def is_release_at_or_below(tag: str, version: Tuple[int, int, int]) -> bool:
     """
-    Check if patch version of software is the highest.
+    Check if tag is a release at or below version.
 
     Parameters
     ----------
-    patch : int
-        Patch version to analyze.
-    patches : List[int]
-        List of Patch versions of the software.
+    tag : str
+        Tag of the software.
+    version : Tuple[int, int, int]
+        Major, Minor and Patch versions to compare with.
 
     Returns
     -------
     bool
-        True if it is the highest version; False otherwise.
+        True if tag is a release at or below version; False otherwise.
 
     """
-    return patch >= min(patches)
+    release = parse_release(tag)
+    return release is not None and release <= version
 
 
 def get_updates(
-    tags: List[str], versions: Dict[str, List[int]]
+    tags: Iterable[str], versions: Dict[str, List[int]]
 ) -> List[Tuple[int, int, int]]:
     """
     Get available updates from tags, looking to project versions.
 
+    Tags are indexed in a single pass, skipping pre-releases, and updates
+    are found by bisecting the index past the project versions.
+
     Parameters
     ----------
-    tags : List[str]
+    tags : Iterable[str]
         Tags of software to check for updates.
     versions : Dict[str, List[int]]
         Project versions of the software.
@@ -78,40 +73,7 @@ def get_updates(
         available versions for update.
 
     """
-    tags_without_pre_releases = [
-        tag
-        for tag in tags
-        if len(tag.split(".", maxsplit=2)) == 3
-        and all(label.isdigit() for label in tag.split(".", maxsplit=2))
-    ]
-
-    tags_serialized: Dict[str, List[int]] = {}
-    for tag in tags_without_pre_releases:
-        major_and_minor, patch = tag.rsplit(".", maxsplit=1)
-        if tags_serialized.get(major_and_minor):
-            tags_serialized[major_and_minor].append(int(patch))
-        else:
-            tags_serialized[major_and_minor] = [int(patch)]
-
-    patch_updates = [
-        (*tag_str_to_tuple(version), patch)
-        for version, patches in versions.items()
-        for patch in filter(
-            partial(patch_is_highest, patches=patches),
-            tags_serialized[version],
-        )
-        if patch not in patches
-    ]
-
-    major_and_minor_updates = [
-        (*tag_str_to_tuple(tag), patch)
-        for tag, patches in tags_serialized.items()
-        for patch in patches
-        if tag_str_to_tuple(tag)
-        > max(tag_str_to_tuple(version) for version in versions)
-    ]
-
-    return sorted(patch_updates + major_and_minor_updates)
+    return VersionIndex.from_tags(tags).get_updates(versions)
 
 
 def update_software_versions(
@@ -191,42 +153,100 @@ def update_software_versions(
     print(color_text(f"{software} versions updated successfully", "green"))
 
 
-def update(poetry: bool = False, python: bool = False) -> None:
+def check_for_updates(
+    software: str,
+    versions: Dict[str, List[int]],
+    fetch_tags: Callable[[UpdateCache], Iterator[str]],
+) -> None:
     """
-    Update Poetry or Python Docker Image versions and push it to main branch.
+    Check for software updates among tags not seen by last check.
+
+    Tags are fetched with conditional requests, and only release tags not
+    seen by the last successful check (with the same project's config file)
+    are looked at; they are recorded only after the update succeeds.
+
+    Parameters
+    ----------
+    software : str
+        The software to update (Poetry or Python).
+    versions : Dict[str, List[int]]
+        Project versions of the software.
+    fetch_tags : Callable[[UpdateCache], Iterator[str]]
+        Function fetching tags of the software, using the update cache.
+
+    """
+    cache = UpdateCache(UPDATE_CACHE_FILES[software])
+    seen = cache.get_seen_tags(Path(__file__).read_bytes())
+    releases = {tag for tag in fetch_tags(cache) if parse_release(tag)}
+    update_software_versions(
+        software=software,
+        updates=get_updates(releases - seen, versions),
+        versions=versions,
+    )
+    cache.store_seen_tags(Path(__file__).read_bytes(), seen | releases)
+    cache.save()
+
+
+def check_software_updates(
+    client: HTTPClient, poetry: bool = False, python: bool = False
+) -> None:
+    """
+    Check for Poetry or Python Docker Image updates, sharing HTTP client.
 
     Parameters
     ----------
+    client : HTTPClient
+        Client sending the requests.
     poetry : bool
-        Updates Poetry versions, by default False.
+        Checks for Poetry updates, by default False.
     python : bool
-        Updates Python Oficial Docker Image versions, by default False.
+        Checks for Python Oficial Docker Image updates, by default False.
 
     """
     if poetry:
-        with request.urlopen(  # nosec
-            "https://api.github.com/repos/python-poetry/poetry/tags"
-        ) as response:
-            tags = [info["name"] for info in json.load(response)]
-            updates = get_updates(tags, POETRY_VERSIONS)
-        update_software_versions(
-            software="Poetry", updates=updates, versions=POETRY_VERSIONS
+        check_for_updates(
+            "Poetry",
+            POETRY_VERSIONS,
+            lambda cache: iter_github_tags(
+                "python-poetry/poetry",
+                stop=partial(
+                    is_release_at_or_below,
+                    version=get_oldest_version(POETRY_VERSIONS),
+                ),
+                cache=cache,
+                client=client,
+            ),
         )
 
     if python:
-        with request.urlopen(  # nosec
-            "https://auth.docker.io/token"
-            "?service=registry.docker.io"
-            "&scope=repository:library/python:pull"
-        ) as token_response:
-            token = json.load(token_response)["token"]
-        python_docker_image = request.Request(
-            "https://index.docker.io/v2/library/python/tags/list"
-        )
-        python_docker_image.add_header("Authorization", f"Bearer {token}")
-        with request.urlopen(python_docker_image) as response:  # nosec
-            tags = list(json.load(response)["tags"])
-            updates = get_updates(tags, PYTHON_VERSIONS)
-        update_software_versions(
-            software="Python", updates=updates, versions=PYTHON_VERSIONS
+        check_for_updates(
+            "Python",
+            PYTHON_VERSIONS,
+            lambda cache: iter_registry_tags(
+                "https://index.docker.io",
+                "library/python",
+                token_url=DOCKER_AUTH_URL,
+                cache=cache,
+                client=client,
+            ),
         )
+
+
+def update(poetry: bool = False, python: bool = False) -> None:
+    """
+    Update Poetry or Python Docker Image versions and push it to main branch.
+
+    Parameters
+    ----------
+    poetry : bool
+        Updates Poetry versions, by default False.
+    python : bool
+        Updates Python Oficial Docker Image versions, by default False.
+
+    """
+    client = HTTPClient()
+    try:
+        check_software_updates(client, poetry=poetry, python=python)
+    finally:
+        client.close()
+        client.report_timings()
@@ -1,7 +1,7 @@
 """Config file for pipeline CLI."""
 
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List
 
 POETRY_VERSIONS: Dict[str, List[int]] = {
     "1.1": [
@@ -50,7 +50,39 @@ PYTHON_VARIATIONS: Dict[str, List[str]] = {
     "bullseye": ["", "-bullseye"],
     "slim-bullseye": ["-slim", "-slim-bullseye"],
 }
+LATEST_VARIATION: str = "bullseye"
+VARIATION_WEIGHTS: Dict[str, float] = {
+    "bullseye": 3.0,
+    "slim-bullseye": 1.0,
+}
+
+BASE_IMAGE_SIZES_MB: Dict[str, int] = {
+    "bullseye": 330,
+    "slim-bullseye": 45,
+}
+REGISTRIES: List[str] = [
+    "mateusoliveira43/poetry",
+]
+IMAGE_REPOSITORY: str = REGISTRIES[0]
+BUILD_CACHE_REPOSITORY: str = "mateusoliveira43/poetry-buildcache"
 
 PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent.parent
 TEMPLATE_FOLDER: Path = PROJECT_ROOT / "templates"
 NEW_VERSIONS_FILE = PROJECT_ROOT / ".github/new_versions.json"
+CACHE_FOLDER: Path = PROJECT_ROOT / ".pipeline_cache"
+BUILD_CACHE_FOLDER: Path = CACHE_FOLDER / "buildx-cache"
+DOCKERFILES_MANIFEST_FILE: Path = CACHE_FOLDER / "dockerfiles.json"
+FRAGMENT_FOLDER: Path = TEMPLATE_FOLDER / "fragments"
+TEMPLATE_PLACEHOLDERS: FrozenSet[str] = frozenset(
+    {"PYTHON_VERSION", "POETRY_VERSION"}
+)
+PUBLISHED_FILE: Path = CACHE_FOLDER / "published.json"
+PLAN_CACHE_FOLDER: Path = CACHE_FOLDER / "plan"
+PLAN_CACHE_MAX_SIZE: int = 4 * 1024 * 1024
+BAKE_CONTEXT_FOLDER: Path = CACHE_FOLDER / "bake-context"
+TIMINGS_FILE: Path = CACHE_FOLDER / "timings.jsonl"
+TIMINGS_HISTORY: int = 5
+UPDATE_CACHE_FILES: Dict[str, Path] = {
+    "Poetry": CACHE_FOLDER / "update-poetry.json",
+    "Python": CACHE_FOLDER / "update-python.json",
+}
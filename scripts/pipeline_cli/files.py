@@ -0,0 +1,56 @@
+"""File helpers shared by pipeline commands."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+def get_hash(data: bytes) -> str:
+    """
+    Get SHA-256 hash of data.
+
+    Parameters
+    ----------
+    data : bytes
+        Data to hash.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of data.
+
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write data to file atomically.
+
+    Data is written to a temporary file in the same folder, that is then
+    renamed to path, so path has either its old or its new data.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the file.
+    data : bytes
+        Data to write.
+
+    """
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = 0o644
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, mode="wb") as file:
+            file.write(data)
+        os.chmod(temporary_path, mode)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
@@ -0,0 +1,183 @@
+"""Fingerprints of published Docker Images."""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .files import atomic_write, get_hash
+
+FROM_PATTERN = re.compile(
+    r"^FROM\s+(?:--platform=\S+\s+)?(\S+)", re.IGNORECASE | re.MULTILINE
+)
+
+Fingerprints = Dict[str, Dict[str, str]]
+
+
+def get_base_images(dockerfile_data: str) -> List[str]:
+    """
+    Get base Images references of Dockerfile.
+
+    Parameters
+    ----------
+    dockerfile_data : str
+        Dockerfile file data.
+
+    Returns
+    -------
+    List[str]
+        Base Images references, in the order of the FROM instructions.
+
+    """
+    return FROM_PATTERN.findall(dockerfile_data)
+
+
+def get_fingerprint(dockerfile_data: str) -> str:
+    """
+    Get fingerprint of Docker Image built from Dockerfile.
+
+    Base Images are only tracked by their references in the FROM
+    instructions, which are part of the Dockerfile; a base Image rebuilt
+    under the same tag does not change the fingerprint.
+
+    Parameters
+    ----------
+    dockerfile_data : str
+        Dockerfile file data.
+
+    Returns
+    -------
+    str
+        Hash of Dockerfile.
+
+    """
+    return get_hash(dockerfile_data.encode("utf-8"))
+
+
+def read_fingerprints(path: Path) -> Optional[Fingerprints]:
+    """
+    Read fingerprints manifest.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the fingerprints manifest.
+
+    Returns
+    -------
+    Optional[Fingerprints]
+        Version and fingerprint of the Image of each tag; None, if there is no
+        valid manifest.
+
+    """
+    try:
+        fingerprints: Fingerprints = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return fingerprints
+
+
+def write_fingerprints(path: Path, fingerprints: Fingerprints) -> None:
+    """
+    Write fingerprints manifest.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the fingerprints manifest.
+    fingerprints : Fingerprints
+        Version and fingerprint of the Image of each tag.
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(
+        path,
+        (json.dumps(fingerprints, indent=2, sort_keys=True) + "\n").encode(),
+    )
+
+
+def get_published_sources(
+    published: Fingerprints,
+) -> Dict[Tuple[str, str], str]:
+    """
+    Get a published tag of each published Image.
+
+    Parameters
+    ----------
+    published : Fingerprints
+        Version and fingerprint of the Image of each published tag.
+
+    Returns
+    -------
+    Dict[Tuple[str, str], str]
+        Tag of each version and fingerprint pair, preferring the tag named
+        after the Image version.
+
+    """
+    sources: Dict[Tuple[str, str], str] = {}
+    for tag, image in sorted(published.items()):
+        key = (image["version"], image["fingerprint"])
+        if key not in sources or tag == image["version"]:
+            sources[key] = tag
+    return sources
+
+
+def get_changed_versions(
+    current: Fingerprints, published: Fingerprints
+) -> Set[str]:
+    """
+    Get versions of Images with a tag that changed since last publish.
+
+    Images already published under another tag are not included, as their
+    changed tags only need to be copied (see get_retags).
+
+    Parameters
+    ----------
+    current : Fingerprints
+        Version and fingerprint of the Image of each tag of the project.
+    published : Fingerprints
+        Version and fingerprint of the Image of each published tag.
+
+    Returns
+    -------
+    Set[str]
+        Versions of Images that need to be built.
+
+    """
+    sources = get_published_sources(published)
+    return {
+        image["version"]
+        for tag, image in current.items()
+        if published.get(tag) != image
+        and (image["version"], image["fingerprint"]) not in sources
+    }
+
+
+def get_retags(
+    current: Fingerprints, published: Fingerprints
+) -> Dict[str, List[str]]:
+    """
+    Get tags that moved to an already published Image since last publish.
+
+    Parameters
+    ----------
+    current : Fingerprints
+        Version and fingerprint of the Image of each tag of the project.
+    published : Fingerprints
+        Version and fingerprint of the Image of each published tag.
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        Sorted tags to point to each published source tag.
+
+    """
+    sources = get_published_sources(published)
+    retags: Dict[str, List[str]] = {}
+    for tag, image in sorted(current.items()):
+        if published.get(tag) == image:
+            continue
+        source = sources.get((image["version"], image["fingerprint"]))
+        if source:
+            retags.setdefault(source, []).append(tag)
+    return retags
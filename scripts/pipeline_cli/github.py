@@ -0,0 +1,73 @@
+"""GitHub REST API tags client."""
+
+from typing import Callable, Iterator, Optional
+
+from .http_client import HTTPClient
+from .registry import get_next_link
+from .update_cache import UpdateCache, open_page
+
+API_URL = "https://api.github.com"
+PER_PAGE = 100
+
+
+def iter_github_tags(  # pylint: disable=too-many-arguments
+    repository: str,
+    stop: Optional[Callable[[str], bool]] = None,
+    api_url: str = API_URL,
+    per_page: int = PER_PAGE,
+    cache: Optional[UpdateCache] = None,
+    client: Optional[HTTPClient] = None,
+) -> Iterator[str]:
+    """
+    Iterate over tag names of GitHub repository, page by page.
+
+    Pages of the maximum size are requested, following the next link of
+    the Link header, until a page has a tag where stop is True; that page is
+    yielded to its end, as tags are not strictly ordered. With a cache,
+    pages are requested conditionally (not modified responses do not count
+    for GitHub rate limit), and the cached release tags of not modified
+    pages are yielded instead.
+
+    Parameters
+    ----------
+    repository : str
+        Repository name (for example, python-poetry/poetry).
+    stop : Optional[Callable[[str], bool]], optional
+        Check of tag after which no more pages are needed, by default None
+    api_url : str, optional
+        URL of the GitHub REST API, by default API_URL
+    per_page : int, optional
+        Number of tags per page, by default PER_PAGE
+    cache : Optional[UpdateCache], optional
+        Cache of the pages, by default None
+    client : Optional[HTTPClient], optional
+        Client sending the requests, by default a new one
+
+    Yields
+    ------
+    Iterator[str]
+        Tag names, in GitHub order (newest first).
+
+    """
+    url: Optional[
+        str
+    ] = f"{api_url}/repos/{repository}/tags?per_page={per_page}"
+    client = client or HTTPClient()
+    while url:
+        page = open_page(
+            client, url, {"Accept": "application/vnd.github+json"}, cache
+        )
+        if page is None:
+            cached_page = cache.pages[url] if cache else {}
+            names = cached_page.get("tags", [])
+            next_url = cached_page.get("next")
+        else:
+            data, headers = page
+            names = [tag["name"] for tag in data]
+            next_url = get_next_link(url, headers.get("Link"))
+            if cache:
+                cache.store_page(url, headers, names, next_url)
+        yield from names
+        if stop and any(stop(name) for name in names):
+            return
+        url = next_url
@@ -0,0 +1,419 @@
+"""Pooled HTTP client of registries and APIs."""
+
+import http.client
+import json
+import random
+import sys
+import time
+from email.message import Message
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib import parse
+
+from . import __version__
+
+USER_AGENT = f"docker-image-poetry-pipeline/{__version__}"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_RETRIES = 3
+MAX_REDIRECTS = 5
+BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 30.0
+TIMEOUT_SECONDS = 30.0
+TOKEN_EXPIRY_SECONDS = 60
+TOKEN_EXPIRY_MARGIN_SECONDS = 10
+
+
+class HTTPError(Exception):
+    """Error raised when a request gets an unsuccessful response."""
+
+    def __init__(self, url: str, status: int, reason: str) -> None:
+        """
+        Initialize HTTP error.
+
+        Parameters
+        ----------
+        url : str
+            URL of the request.
+        status : int
+            Status code of the response.
+        reason : str
+            Reason phrase of the response.
+
+        """
+        super().__init__(f"{url}: HTTP {status} {reason}")
+        self.url = url
+        self.status = status
+        self.reason = reason
+
+
+class Response(NamedTuple):
+    """Read response of a request."""
+
+    url: str
+    status: int
+    reason: str
+    headers: Message
+    body: bytes
+
+    def json(self) -> Any:
+        """
+        Decode JSON body of response.
+
+        Returns
+        -------
+        Any
+            Decoded body.
+
+        """
+        return json.loads(self.body)
+
+
+class RequestTiming(NamedTuple):
+    """Duration of a request attempt."""
+
+    url: str
+    status: int
+    seconds: float
+    attempt: int
+    reused: bool
+
+
+def get_retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """
+    Get seconds to wait before retrying request.
+
+    Retry-After seconds are honored; otherwise, the delay is a random value
+    up to an exponential backoff (full jitter), so clients retrying at the
+    same time spread out.
+
+    Parameters
+    ----------
+    attempt : int
+        Number of the failed attempt, starting at 0.
+    retry_after : Optional[str]
+        Retry-After header of the failed attempt.
+
+    Returns
+    -------
+    float
+        Seconds to wait, at most MAX_BACKOFF_SECONDS.
+
+    """
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), MAX_BACKOFF_SECONDS)
+    backoff = min(BACKOFF_SECONDS * 2**attempt, MAX_BACKOFF_SECONDS)
+    return random.uniform(0, backoff)  # nosec
+
+
+def split_url(url: str) -> Tuple[str, str, str]:
+    """
+    Split URL into its scheme, host and request target.
+
+    Parameters
+    ----------
+    url : str
+        URL to split.
+
+    Returns
+    -------
+    Tuple[str, str, str]
+        Scheme, host and port, and path with query of the URL.
+
+    """
+    scheme, netloc, path, query, _ = parse.urlsplit(url)
+    return scheme, netloc, f"{path or '/'}?{query}" if query else path or "/"
+
+
+class HTTPClient:
+    """HTTP client with keep-alive connections per host and cached tokens."""
+
+    __slots__ = ("connections", "tokens", "timings", "retries", "timeout")
+
+    def __init__(
+        self, retries: int = MAX_RETRIES, timeout: float = TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Initialize HTTP client.
+
+        Parameters
+        ----------
+        retries : int, optional
+            Retries of requests failing with 429 or 5xx status codes or
+            connection errors, by default MAX_RETRIES
+        timeout : float, optional
+            Seconds to wait for connections and responses, by default
+            TIMEOUT_SECONDS
+
+        """
+        self.connections: Dict[
+            Tuple[str, str], http.client.HTTPConnection
+        ] = {}
+        self.tokens: Dict[str, Tuple[str, float]] = {}
+        self.timings: List[RequestTiming] = []
+        self.retries = retries
+        self.timeout = timeout
+
+    def get_connection(
+        self, scheme: str, netloc: str
+    ) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Get connection to host, opening it if there is none.
+
+        Parameters
+        ----------
+        scheme : str
+            URL scheme (http or https).
+        netloc : str
+            Host and port.
+
+        Returns
+        -------
+        Tuple[http.client.HTTPConnection, bool]
+            Connection to host and if it was already open.
+
+        """
+        if (scheme, netloc) in self.connections:
+            return self.connections[(scheme, netloc)], True
+        connection_class = (
+            http.client.HTTPSConnection
+            if scheme == "https"
+            else http.client.HTTPConnection
+        )
+        connection = connection_class(netloc, timeout=self.timeout)
+        self.connections[(scheme, netloc)] = connection
+        return connection, False
+
+    def drop_connection(self, scheme: str, netloc: str) -> None:
+        """
+        Close connection to host and remove it from pool.
+
+        Parameters
+        ----------
+        scheme : str
+            URL scheme (http or https).
+        netloc : str
+            Host and port.
+
+        """
+        connection = self.connections.pop((scheme, netloc), None)
+        if connection:
+            connection.close()
+
+    def send(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        method: str = "GET",
+        body: Optional[bytes] = None,
+    ) -> Response:
+        """
+        Send request, retrying on 429, 5xx and connection errors.
+
+        A User-Agent header (required by GitHub REST API) is sent, unless
+        headers have one.
+
+        Parameters
+        ----------
+        url : str
+            URL of the request.
+        headers : Dict[str, str]
+            Request headers.
+        method : str, optional
+            Request method, by default "GET"
+        body : Optional[bytes], optional
+            Request body, by default None
+
+        Returns
+        -------
+        Response
+            Response of the last attempt.
+
+        Raises
+        ------
+        OSError
+            If the last attempt fails to connect.
+
+        """
+        headers = {"User-Agent": USER_AGENT, **headers}
+        scheme, netloc, target = split_url(url)
+        attempt = 0
+        while True:
+            connection, reused = self.get_connection(scheme, netloc)
+            start = time.perf_counter()
+            try:
+                connection.request(method, target, body=body, headers=headers)
+                http_response = connection.getresponse()
+                body = http_response.read()
+            except (http.client.HTTPException, OSError):
+                self.drop_connection(scheme, netloc)
+                # a kept-alive connection closed by the server is reopened
+                # without counting as a retry
+                if reused:
+                    continue
+                if attempt >= self.retries:
+                    raise
+                time.sleep(get_retry_delay(attempt, None))
+                attempt += 1
+                continue
+            status = http_response.status
+            self.timings.append(
+                RequestTiming(
+                    url=url,
+                    status=status,
+                    seconds=time.perf_counter() - start,
+                    attempt=attempt,
+                    reused=reused,
+                )
+            )
+            if http_response.will_close:
+                self.drop_connection(scheme, netloc)
+            if status in RETRY_STATUSES and attempt < self.retries:
+                time.sleep(
+                    get_retry_delay(
+                        attempt, http_response.headers.get("Retry-After")
+                    )
+                )
+                attempt += 1
+                continue
+            return Response(
+                url=url,
+                status=status,
+                reason=http_response.reason,
+                headers=http_response.headers,
+                body=body,
+            )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+    ) -> Response:
+        """
+        Request URL, following redirects of GET and HEAD requests.
+
+        The Authorization header is not sent to other hosts redirected to.
+
+        Parameters
+        ----------
+        method : str
+            Request method.
+        url : str
+            URL of the request.
+        headers : Optional[Dict[str, str]], optional
+            Request headers, by default None
+        body : Optional[bytes], optional
+            Request body, by default None
+
+        Returns
+        -------
+        Response
+            Successful or not modified response.
+
+        Raises
+        ------
+        HTTPError
+            If response has an error status code or redirects too many times.
+
+        """
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self.send(url, headers, method, body)
+            location = response.headers.get("Location")
+            if (
+                method not in ("GET", "HEAD")
+                or response.status not in REDIRECT_STATUSES
+                or not location
+            ):
+                break
+            next_url = parse.urljoin(url, location)
+            if parse.urlsplit(next_url)[1] != parse.urlsplit(url)[1]:
+                headers.pop("Authorization", None)
+            url = next_url
+        else:
+            raise HTTPError(url, response.status, "too many redirects")
+        if response.status >= 400 or (
+            method in ("GET", "HEAD") and response.status in REDIRECT_STATUSES
+        ):
+            raise HTTPError(url, response.status, response.reason)
+        return response
+
+    def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """
+        Send GET request to URL, following redirects.
+
+        Parameters
+        ----------
+        url : str
+            URL of the request.
+        headers : Optional[Dict[str, str]], optional
+            Request headers, by default None
+
+        Returns
+        -------
+        Response
+            Successful or not modified response.
+
+        """
+        return self.request("GET", url, headers)
+
+    def get_token(
+        self,
+        url: str,
+        refresh: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Get bearer token from token server, reusing it until it expires.
+
+        Parameters
+        ----------
+        url : str
+            URL of the token, with its service and scope.
+        refresh : bool, optional
+            Get a new token even if the cached one has not expired (for
+            example, after it was rejected), by default False
+        headers : Optional[Dict[str, str]], optional
+            Headers of the token request (for example, with credentials), by
+            default None
+
+        Returns
+        -------
+        str
+            Bearer token.
+
+        """
+        token, expiry = self.tokens.get(url, ("", 0.0))
+        if token and not refresh and time.monotonic() < expiry:
+            return token
+        data = self.get(url, headers).json()
+        token = str(data.get("token") or data["access_token"])
+        expires_in = int(data.get("expires_in") or TOKEN_EXPIRY_SECONDS)
+        self.tokens[url] = (
+            token,
+            time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN_SECONDS,
+        )
+        return token
+
+    def report_timings(self) -> None:
+        """Print number and duration of requests per host to standard error."""
+        hosts: Dict[str, List[RequestTiming]] = {}
+        for timing in self.timings:
+            hosts.setdefault(parse.urlsplit(timing.url)[1], []).append(timing)
+        for host, timings in hosts.items():
+            print(
+                f"{host}: {len(timings)} requests "
+                f"({sum(not timing.reused for timing in timings)} "
+                f"connections, "
+                f"{sum(timing.attempt > 0 for timing in timings)} retries) "
+                f"in {sum(timing.seconds for timing in timings):.2f}s",
+                file=sys.stderr,
+            )
+
+    def close(self) -> None:
+        """Close all connections."""
+        for scheme, netloc in list(self.connections):
+            self.drop_connection(scheme, netloc)
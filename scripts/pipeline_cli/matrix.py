@@ -0,0 +1,261 @@
+"""Precomputed index of project's versions matrix."""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from . import config
+
+VersionPair = Tuple[str, int]
+
+
+def minor_to_tuple(minor_version: str) -> Tuple[int, ...]:
+    """
+    Convert Major and Minor version string to tuple of integers.
+
+    Parameters
+    ----------
+    minor_version : str
+        Major and Minor version of software.
+
+    Returns
+    -------
+    Tuple[int, ...]
+        Major and Minor versions converted.
+
+    """
+    return tuple(map(int, minor_version.split(".")))
+
+
+def select_pairs(
+    versions: List[str], index: Dict[VersionPair, int]
+) -> List[VersionPair]:
+    """
+    Select versions present in the matrix, in matrix order.
+
+    Parameters
+    ----------
+    versions : List[str]
+        Versions in format major.minor.patch.
+    index : Dict[VersionPair, int]
+        Position of each Major and Minor and Patch version pair of the
+        software in the matrix.
+
+    Returns
+    -------
+    List[VersionPair]
+        Major and Minor and Patch version pairs of the versions present in
+        the matrix.
+
+    """
+    pairs = set()
+    for version in versions:
+        minor, _, patch = version.rpartition(".")
+        if patch.isdigit() and (minor, int(patch)) in index:
+            pairs.add((minor, int(patch)))
+    return sorted(pairs, key=index.__getitem__)
+
+
+# the lookups of both softwares are kept as flat slots, read by the hot
+# paths of tag names and selectors without an extra attribute access
+class VersionMatrix:  # pylint: disable=too-many-instance-attributes
+    """Index of Poetry and Python versions, built once per process."""
+
+    __slots__ = (
+        "poetry_versions",
+        "python_versions",
+        "variations",
+        "poetry_highest",
+        "python_highest",
+        "newest_poetry",
+        "newest_python",
+        "latest",
+        "poetry_index",
+        "python_index",
+    )
+
+    def __init__(
+        self,
+        poetry_versions: Dict[str, List[int]],
+        python_versions: Dict[str, List[int]],
+        variations: Dict[str, List[str]],
+        latest_variation: str,
+    ) -> None:
+        """
+        Initialize versions matrix.
+
+        Parameters
+        ----------
+        poetry_versions : Dict[str, List[int]]
+            Versions of Poetry.
+        python_versions : Dict[str, List[int]]
+            Versions of Python.
+        variations : Dict[str, List[str]]
+            Python Oficial Image variations and their aliases.
+        latest_variation : str
+            Python Oficial Image variation of the latest tag.
+
+        """
+        self.poetry_versions = poetry_versions
+        self.python_versions = python_versions
+        self.variations = variations
+        self.poetry_highest = {
+            minor: max(patches) for minor, patches in poetry_versions.items()
+        }
+        self.python_highest = {
+            minor: max(patches) for minor, patches in python_versions.items()
+        }
+        self.newest_poetry = max(poetry_versions, key=minor_to_tuple)
+        self.newest_python = max(python_versions, key=minor_to_tuple)
+        self.poetry_index: Dict[VersionPair, int] = {
+            pair: index
+            for index, pair in enumerate(
+                (minor, patch)
+                for minor, patches in poetry_versions.items()
+                for patch in patches
+            )
+        }
+        self.python_index: Dict[VersionPair, int] = {
+            pair: index
+            for index, pair in enumerate(
+                (minor, patch)
+                for minor, patches in python_versions.items()
+                for patch in patches
+            )
+        }
+        self.latest = (
+            f"{self.poetry_version(self.newest_poetry)}-python"
+            f"{self.python_version(self.newest_python)}-{latest_variation}"
+        )
+
+    def poetry_version(self, minor_version: str) -> str:
+        """
+        Get Poetry version for Dockerfile.
+
+        Parameters
+        ----------
+        minor_version : str
+            Major and Minor version of Poetry.
+
+        Returns
+        -------
+        str
+            Highest Poetry version in format major.minor.patch.
+
+        """
+        return f"{minor_version}.{self.poetry_highest[minor_version]}"
+
+    def python_version(self, minor_version: str) -> str:
+        """
+        Get Python version for Dockerfile.
+
+        Parameters
+        ----------
+        minor_version : str
+            Major and Minor version of Python.
+
+        Returns
+        -------
+        str
+            Highest Python version in format major.minor.patch.
+
+        """
+        return f"{minor_version}.{self.python_highest[minor_version]}"
+
+    def is_floating(
+        self,
+        poetry_minor: str,
+        poetry_patch: int,
+        python_minor: str,
+        python_patch: int,
+    ) -> bool:
+        """
+        Check if Image gets the floating (Major and Minor only) tags.
+
+        Parameters
+        ----------
+        poetry_minor : str
+            Major and Minor version of Poetry.
+        poetry_patch : int
+            Patch version of Poetry.
+        python_minor : str
+            Major and Minor version of Python.
+        python_patch : int
+            Patch version of Python.
+
+        Returns
+        -------
+        bool
+            True if both patches are the highest of their minors; False
+            otherwise.
+
+        """
+        return (
+            poetry_patch == self.poetry_highest[poetry_minor]
+            and python_patch == self.python_highest[python_minor]
+        )
+
+    # pylint: disable=too-many-arguments
+    def tag_names(
+        self,
+        poetry_minor: str,
+        poetry_patch: int,
+        python_minor: str,
+        python_patch: int,
+        variation: str,
+    ) -> List[str]:
+        """
+        Get names of the tags to add to Docker Image in Docker hub.
+
+        Parameters
+        ----------
+        poetry_minor : str
+            Major and Minor version of Poetry.
+        poetry_patch : int
+            Patch version of Poetry
+        python_minor : str
+            Major and Minor version of Python
+        python_patch : int
+            Patch version of Python
+        variation : str
+            Python Oficial Image variation (for example, bullseye).
+
+        Returns
+        -------
+        List[str]
+            Sorted tag names for image.
+
+        """
+        version = (
+            f"{poetry_minor}.{poetry_patch}-python"
+            f"{python_minor}.{python_patch}"
+        )
+        tags = {f"{version}{alias}" for alias in self.variations[variation]}
+        if self.is_floating(
+            poetry_minor, poetry_patch, python_minor, python_patch
+        ):
+            tags.update(
+                f"{poetry_minor}-python{python_minor}{alias}"
+                for alias in self.variations[variation]
+            )
+        if f"{version}-{variation}" == self.latest:
+            tags.add("latest")
+        return sorted(tags)
+
+
+@lru_cache(maxsize=None)
+def get_version_matrix() -> VersionMatrix:
+    """
+    Get versions matrix of project's config.
+
+    Returns
+    -------
+    VersionMatrix
+        Versions matrix, built on first call.
+
+    """
+    return VersionMatrix(
+        poetry_versions=config.POETRY_VERSIONS,
+        python_versions=config.PYTHON_VERSIONS,
+        variations=config.PYTHON_VARIATIONS,
+        latest_variation=config.LATEST_VARIATION,
+    )
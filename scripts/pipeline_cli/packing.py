@@ -0,0 +1,121 @@
+"""Packing of pipeline jobs by shared base Images."""
+
+from typing import Dict, List, Tuple
+
+from .config import BASE_IMAGE_SIZES_MB
+from .fingerprint import get_base_images
+from .targets import parse_build_target
+from .template import render_dockerfile
+
+
+def get_version_base_images(version: str) -> Tuple[str, ...]:
+    """
+    Get base Images of Image version.
+
+    Parameters
+    ----------
+    version : str
+        Full version of the Image, in format
+        POETRY_VERSION-pythonPYTHON_VERSION-PYTHON_VARIATION.
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Base Images references of the Image's Dockerfile, without repeats.
+
+    Raises
+    ------
+    ValueError
+        If version is not in the versions matrix.
+
+    """
+    target = parse_build_target(version)
+    dockerfile = render_dockerfile(
+        variation=target.variation,
+        python_version=target.python_version,
+        poetry_version=target.poetry_version,
+    )
+    return tuple(dict.fromkeys(get_base_images(dockerfile)))
+
+
+def group_by_base_images(bases: List[Tuple[str, ...]]) -> List[List[int]]:
+    """
+    Group items sharing, directly or through other items, a base Image.
+
+    Parameters
+    ----------
+    bases : List[Tuple[str, ...]]
+        Base Images of each item.
+
+    Returns
+    -------
+    List[List[int]]
+        Indexes of the items of each group, in order of first appearance.
+
+    """
+    parents = list(range(len(bases)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    owners: Dict[str, int] = {}
+    for index, images in enumerate(bases):
+        for image in images:
+            if image in owners:
+                parents[find(index)] = find(owners[image])
+            else:
+                owners[image] = index
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(bases)):
+        groups.setdefault(find(index), []).append(index)
+    return list(groups.values())
+
+
+def get_image_size(image: str) -> int:
+    """
+    Get approximate compressed size of Python Oficial Image.
+
+    Parameters
+    ----------
+    image : str
+        Image reference (for example, python:3.11.4-slim-bullseye).
+
+    Returns
+    -------
+    int
+        Size in MB of the Image variation; 0, if unknown.
+
+    """
+    variation = image.rpartition(":")[2].partition("-")[2]
+    return BASE_IMAGE_SIZES_MB.get(variation, 0)
+
+
+def get_pull_volume(
+    packed: List[List[int]], bases: List[Tuple[str, ...]]
+) -> int:
+    """
+    Get volume of base Images pulled by jobs.
+
+    Each job pulls each of its distinct base Images once.
+
+    Parameters
+    ----------
+    packed : List[List[int]]
+        Indexes of the items built by each job.
+    bases : List[Tuple[str, ...]]
+        Base Images of each item.
+
+    Returns
+    -------
+    int
+        Pulled volume in MB.
+
+    """
+    return sum(
+        get_image_size(image)
+        for indexes in packed
+        for image in {image for index in indexes for image in bases[index]}
+    )
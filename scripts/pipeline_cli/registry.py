@@ -0,0 +1,659 @@
+"""Docker registry tags and manifests client."""
+
+import json
+import os
+import re
+from email.message import Message
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib import parse
+
+from .http_client import HTTPClient, HTTPError, Response
+from .update_cache import UpdateCache, open_page
+
+NEXT_LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+CHALLENGE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+PAGE_SIZE = 1000
+DOCKER_HUB_HOST = "registry-1.docker.io"
+DOCKER_HUB_AUTH_KEY = "https://index.docker.io/v1/"
+INDEX_TYPES = frozenset(
+    {
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+    }
+)
+MANIFEST_TYPES = (
+    *sorted(INDEX_TYPES),
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+)
+
+_CHALLENGES: Dict[str, Dict[str, str]] = {}
+
+
+class Repository(NamedTuple):
+    """Repository of a Docker registry."""
+
+    registry: str
+    name: str
+
+    def url(self, path: str) -> str:
+        """
+        Get URL of registry API endpoint of repository.
+
+        Parameters
+        ----------
+        path : str
+            Path of the endpoint, relative to the repository (for example,
+            manifests/latest).
+
+        Returns
+        -------
+        str
+            URL of the endpoint.
+
+        """
+        return f"{self.registry}/v2/{self.name}/{path}"
+
+
+def get_next_link(url: str, link: Optional[str]) -> Optional[str]:
+    """
+    Get URL of the next page from a Link header.
+
+    Parameters
+    ----------
+    url : str
+        URL of the current page.
+    link : Optional[str]
+        Link header of the current page.
+
+    Returns
+    -------
+    Optional[str]
+        Absolute URL of the next page; None, if there is no next link.
+
+    """
+    next_link = NEXT_LINK_PATTERN.search(link or "")
+    return parse.urljoin(url, next_link.group(1)) if next_link else None
+
+
+def get_next_page_url(
+    url: str, link: Optional[str], tags: List[str], page_size: int
+) -> Optional[str]:
+    """
+    Get URL of the next page of a registry tags list.
+
+    Follows the next link of the Link header; registries that do not send it
+    are paginated with the last tag of a full page.
+
+    Parameters
+    ----------
+    url : str
+        URL of the current page.
+    link : Optional[str]
+        Link header of the current page.
+    tags : List[str]
+        Tags of the current page.
+    page_size : int
+        Requested number of tags per page.
+
+    Returns
+    -------
+    Optional[str]
+        URL of the next page; None, if current page is the last.
+
+    """
+    if link:
+        return get_next_link(url, link)
+    if len(tags) < page_size:
+        return None
+    scheme, netloc, path, query, _ = parse.urlsplit(url)
+    parameters = dict(parse.parse_qsl(query))
+    if parameters.get("last") == tags[-1]:
+        return None
+    parameters.update({"n": str(page_size), "last": tags[-1]})
+    return parse.urlunsplit(
+        (scheme, netloc, path, parse.urlencode(parameters), "")
+    )
+
+
+def get_token_headers(
+    client: HTTPClient, token_url: Optional[str], refresh: bool = False
+) -> Dict[str, str]:
+    """
+    Get Authorization header with bearer token of registry.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client caching the token.
+    token_url : Optional[str]
+        URL of the token, with its service and scope.
+    refresh : bool, optional
+        Get a new token, by default False
+
+    Returns
+    -------
+    Dict[str, str]
+        Authorization header; empty, if there is no token URL.
+
+    """
+    if not token_url:
+        return {}
+    token = client.get_token(token_url, refresh=refresh)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def open_registry_page(
+    client: HTTPClient,
+    url: str,
+    token_url: Optional[str] = None,
+    cache: Optional[UpdateCache] = None,
+) -> Optional[Tuple[Any, Message]]:
+    """
+    Request registry page, with a new token if the cached one is rejected.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the request.
+    url : str
+        URL of the page.
+    token_url : Optional[str], optional
+        URL of the bearer token of the repository, by default None
+    cache : Optional[UpdateCache], optional
+        Cache of the page, by default None
+
+    Returns
+    -------
+    Optional[Tuple[Any, Message]]
+        Decoded page and response headers; None, if the cached page was not
+        modified.
+
+    """
+    try:
+        return open_page(
+            client, url, get_token_headers(client, token_url), cache
+        )
+    except HTTPError as error:
+        if error.status != 401 or not token_url:
+            raise
+    return open_page(
+        client, url, get_token_headers(client, token_url, refresh=True), cache
+    )
+
+
+def iter_registry_tags(  # pylint: disable=too-many-arguments
+    registry: str,
+    repository: str,
+    token_url: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+    cache: Optional[UpdateCache] = None,
+    client: Optional[HTTPClient] = None,
+) -> Iterator[str]:
+    """
+    Iterate over tags of repository in Docker registry, page by page.
+
+    Only one page is held in memory, so consumers like VersionIndex can
+    keep the tags they need and drop the rest (for example, -alpine or
+    -windowsservercore variants). With a cache, pages are requested
+    conditionally, and the cached release tags of not modified pages are
+    yielded instead. The bearer token is got from the client for each page,
+    so it is refreshed when it expires or is rejected during pagination.
+
+    Parameters
+    ----------
+    registry : str
+        URL of the registry (for example, https://index.docker.io).
+    repository : str
+        Repository name (for example, library/python).
+    token_url : Optional[str], optional
+        URL of the bearer token of the repository, by default None
+    page_size : int, optional
+        Number of tags per page, by default PAGE_SIZE
+    cache : Optional[UpdateCache], optional
+        Cache of the pages, by default None
+    client : Optional[HTTPClient], optional
+        Client sending the requests, by default a new one
+
+    Yields
+    ------
+    Iterator[str]
+        Tags of the repository, in registry order.
+
+    """
+    url: Optional[str] = f"{registry}/v2/{repository}/tags/list?n={page_size}"
+    client = client or HTTPClient()
+    while url:
+        page = open_registry_page(client, url, token_url, cache)
+        if page is None:
+            cached_page = cache.pages[url] if cache else {}
+            yield from cached_page.get("tags", [])
+            url = cached_page.get("next")
+            continue
+        data, headers = page
+        tags = data.get("tags") or []
+        yield from tags
+        next_url = get_next_page_url(url, headers.get("Link"), tags, page_size)
+        if cache:
+            cache.store_page(url, headers, tags, next_url)
+        url = next_url
+
+
+def parse_repository(reference: str) -> Repository:
+    """
+    Parse Docker repository reference, as accepted by docker push.
+
+    References without a registry host are Docker Hub repositories, and
+    local registries (localhost or 127.0.0.1) are reached over HTTP.
+
+    Parameters
+    ----------
+    reference : str
+        Repository reference (for example, mateusoliveira43/poetry or
+        ghcr.io/mateusoliveira43/poetry).
+
+    Returns
+    -------
+    Repository
+        Registry URL and repository name.
+
+    """
+    host, _, name = reference.partition("/")
+    if not name or not ("." in host or ":" in host or host == "localhost"):
+        host, name = DOCKER_HUB_HOST, reference
+        if "/" not in name:
+            name = f"library/{name}"
+    local = host.partition(":")[0] in ("localhost", "127.0.0.1")
+    return Repository(f"{'http' if local else 'https'}://{host}", name)
+
+
+def get_credentials(registry: str) -> Optional[str]:
+    """
+    Get credentials of registry stored by docker login.
+
+    Only credentials in the Docker config file are read; credential helpers
+    are not supported.
+
+    Parameters
+    ----------
+    registry : str
+        URL of the registry.
+
+    Returns
+    -------
+    Optional[str]
+        Base64 encoded user and password; None, if there are none.
+
+    """
+    config_folder = os.environ.get("DOCKER_CONFIG")
+    config_file = (
+        Path(config_folder) if config_folder else Path.home() / ".docker"
+    ) / "config.json"
+    try:
+        auths = json.loads(config_file.read_text(encoding="utf-8"))["auths"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    host = parse.urlsplit(registry)[1]
+    keys = [host, f"https://{host}"]
+    if host == DOCKER_HUB_HOST:
+        keys.insert(0, DOCKER_HUB_AUTH_KEY)
+    for key in keys:
+        if isinstance(auths.get(key), dict) and auths[key].get("auth"):
+            return str(auths[key]["auth"])
+    return None
+
+
+def get_challenge(client: HTTPClient, registry: str) -> Dict[str, str]:
+    """
+    Get authentication challenge of registry, requesting it once.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the request.
+    registry : str
+        URL of the registry.
+
+    Returns
+    -------
+    Dict[str, str]
+        Scheme and parameters (for example, realm and service) of the
+        WWW-Authenticate header; empty, if registry needs no authentication.
+
+    """
+    if registry not in _CHALLENGES:
+        response = client.send(f"{registry}/v2/", {})
+        header = response.headers.get("WWW-Authenticate") or ""
+        scheme, _, parameters = header.partition(" ")
+        challenge = dict(CHALLENGE_PATTERN.findall(parameters))
+        if response.status == 401 and scheme:
+            challenge["scheme"] = scheme.lower()
+        else:
+            challenge = {}
+        _CHALLENGES[registry] = challenge
+    return _CHALLENGES[registry]
+
+
+def get_auth_headers(
+    client: HTTPClient,
+    registry: str,
+    scopes: Sequence[str],
+    refresh: bool = False,
+) -> Dict[str, str]:
+    """
+    Get Authorization header of registry requests.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client caching the token.
+    registry : str
+        URL of the registry.
+    scopes : Sequence[str]
+        Scopes of the token (for example, repository:library/python:pull).
+    refresh : bool, optional
+        Get a new token, by default False
+
+    Returns
+    -------
+    Dict[str, str]
+        Authorization header; empty, if registry needs no authentication.
+
+    """
+    challenge = get_challenge(client, registry)
+    credentials = get_credentials(registry)
+    if challenge.get("scheme") == "basic":
+        return {"Authorization": f"Basic {credentials}"} if credentials else {}
+    if challenge.get("scheme") != "bearer" or "realm" not in challenge:
+        return {}
+    query = [("scope", scope) for scope in scopes]
+    if "service" in challenge:
+        query.insert(0, ("service", challenge["service"]))
+    token = client.get_token(
+        f"{challenge['realm']}?{parse.urlencode(query)}",
+        refresh=refresh,
+        headers=(
+            {"Authorization": f"Basic {credentials}"} if credentials else {}
+        ),
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def send_registry_request(  # pylint: disable=too-many-arguments
+    client: HTTPClient,
+    method: str,
+    url: str,
+    scopes: Sequence[str],
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[bytes] = None,
+) -> Response:
+    """
+    Send registry request, with a new token if the cached one is rejected.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the request.
+    method : str
+        Request method.
+    url : str
+        URL of the registry endpoint.
+    scopes : Sequence[str]
+        Scopes of the token of the request.
+    headers : Optional[Dict[str, str]], optional
+        Request headers, by default None
+    body : Optional[bytes], optional
+        Request body, by default None
+
+    Returns
+    -------
+    Response
+        Successful response.
+
+    Raises
+    ------
+    HTTPError
+        If response has an error status code.
+
+    """
+    scheme, netloc, _, _, _ = parse.urlsplit(url)
+    registry = f"{scheme}://{netloc}"
+    headers = headers or {}
+    auth_headers = get_auth_headers(client, registry, scopes)
+    try:
+        return client.request(method, url, {**headers, **auth_headers}, body)
+    except HTTPError as error:
+        if error.status != 401 or not auth_headers:
+            raise
+    auth_headers = get_auth_headers(client, registry, scopes, refresh=True)
+    return client.request(method, url, {**headers, **auth_headers}, body)
+
+
+def get_manifest(
+    client: HTTPClient, repository: Repository, reference: str
+) -> Tuple[bytes, str]:
+    """
+    Get manifest (or index of manifests) of Image.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the request.
+    repository : Repository
+        Repository of the Image.
+    reference : str
+        Tag or digest of the Image.
+
+    Returns
+    -------
+    Tuple[bytes, str]
+        Manifest, byte for byte, and its media type.
+
+    """
+    response = send_registry_request(
+        client,
+        "GET",
+        repository.url(f"manifests/{reference}"),
+        [f"repository:{repository.name}:pull"],
+        {"Accept": ", ".join(MANIFEST_TYPES)},
+    )
+    media_type = response.headers.get("Content-Type") or str(
+        response.json().get("mediaType")
+    )
+    return response.body, media_type.partition(";")[0].strip()
+
+
+def put_manifest(
+    client: HTTPClient,
+    repository: Repository,
+    reference: str,
+    manifest: Tuple[bytes, str],
+) -> None:
+    """
+    Put manifest (or index of manifests) of Image.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the request.
+    repository : Repository
+        Repository of the Image.
+    reference : str
+        Tag or digest of the Image.
+    manifest : Tuple[bytes, str]
+        Manifest and its media type.
+
+    """
+    data, media_type = manifest
+    send_registry_request(
+        client,
+        "PUT",
+        repository.url(f"manifests/{reference}"),
+        [f"repository:{repository.name}:pull,push"],
+        {"Content-Type": media_type},
+        data,
+    )
+
+
+def copy_tags(
+    client: HTTPClient, repository: Repository, source: str, tags: List[str]
+) -> None:
+    """
+    Point tags to the Image of source tag, in the same repository.
+
+    The manifest is put again under each tag, so no blob is uploaded.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the requests.
+    repository : Repository
+        Repository of the Image.
+    source : str
+        Tag of the Image.
+    tags : List[str]
+        Tags to point to the Image.
+
+    """
+    manifest = get_manifest(client, repository, source)
+    for tag in tags:
+        put_manifest(client, repository, tag, manifest)
+
+
+def copy_blob(
+    client: HTTPClient,
+    source: Repository,
+    destination: Repository,
+    digest: str,
+) -> None:
+    """
+    Copy blob to repository, unless it is already there.
+
+    Between repositories of the same registry, the blob is mounted, without
+    transferring it; otherwise, it is downloaded and uploaded in memory.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the requests.
+    source : Repository
+        Repository of the blob.
+    destination : Repository
+        Repository to copy the blob to.
+    digest : str
+        Digest of the blob.
+
+    Raises
+    ------
+    HTTPError
+        If a request fails.
+
+    """
+    scopes = [f"repository:{destination.name}:pull,push"]
+    try:
+        send_registry_request(
+            client, "HEAD", destination.url(f"blobs/{digest}"), scopes
+        )
+        return
+    except HTTPError as error:
+        if error.status != 404:
+            raise
+    upload_url = destination.url("blobs/uploads/")
+    if source.registry == destination.registry:
+        scopes.append(f"repository:{source.name}:pull")
+        query = parse.urlencode({"mount": digest, "from": source.name})
+        upload_url = f"{upload_url}?{query}"
+    response = send_registry_request(client, "POST", upload_url, scopes)
+    if response.status == 201:
+        return
+    data = send_registry_request(
+        client,
+        "GET",
+        source.url(f"blobs/{digest}"),
+        [f"repository:{source.name}:pull"],
+    ).body
+    location = parse.urljoin(upload_url, response.headers["Location"])
+    separator = "&" if "?" in location else "?"
+    send_registry_request(
+        client,
+        "PUT",
+        f"{location}{separator}{parse.urlencode({'digest': digest})}",
+        scopes,
+        {"Content-Type": "application/octet-stream"},
+        data,
+    )
+
+
+def copy_manifest_blobs(
+    client: HTTPClient,
+    source: Repository,
+    destination: Repository,
+    manifest: Tuple[bytes, str],
+) -> None:
+    """
+    Copy config and layers blobs of Image manifest to repository.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the requests.
+    source : Repository
+        Repository of the Image.
+    destination : Repository
+        Repository to copy the blobs to.
+    manifest : Tuple[bytes, str]
+        Manifest of a single platform Image and its media type.
+
+    """
+    content = json.loads(manifest[0])
+    for descriptor in [content["config"], *content.get("layers", [])]:
+        copy_blob(client, source, destination, descriptor["digest"])
+
+
+def copy_image(
+    client: HTTPClient,
+    source: Repository,
+    reference: str,
+    destination: Repository,
+    tags: List[str],
+) -> None:
+    """
+    Copy Image to repository, with its manifests and blobs, under tags.
+
+    The manifests are copied byte for byte, so the Image keeps its digest.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the requests.
+    source : Repository
+        Repository of the Image.
+    reference : str
+        Tag or digest of the Image.
+    destination : Repository
+        Repository to copy the Image to.
+    tags : List[str]
+        Tags of the Image in the destination repository.
+
+    """
+    manifest = get_manifest(client, source, reference)
+    data, media_type = manifest
+    if media_type in INDEX_TYPES:
+        for descriptor in json.loads(data).get("manifests", []):
+            child = get_manifest(client, source, descriptor["digest"])
+            copy_manifest_blobs(client, source, destination, child)
+            put_manifest(client, destination, descriptor["digest"], child)
+    else:
+        copy_manifest_blobs(client, source, destination, manifest)
+    for tag in tags:
+        put_manifest(client, destination, tag, manifest)
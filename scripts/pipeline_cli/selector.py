@@ -0,0 +1,275 @@
+"""Selection of versions matrix build targets."""
+
+import argparse
+import operator
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .matrix import get_version_matrix
+from .targets import (
+    BuildTarget,
+    VariationFilter,
+    VersionFilter,
+    iter_build_targets,
+)
+
+CLAUSE_PATTERN = re.compile(
+    r"^\s*(poetry|python|variation)\s*(~=|==|!=|>=|<=|=|>|<)\s*(\S+?)\s*$"
+)
+VERSION_PATTERN = re.compile(r"^\d+(\.\d+){1,2}$")
+VERSION_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+Version = Tuple[int, ...]
+
+
+class Selector:  # pylint: disable=too-few-public-methods
+    """Filters of versions matrix build targets."""
+
+    __slots__ = ("poetry", "python", "variation", "source")
+
+    def __init__(
+        self,
+        poetry: Optional[VersionFilter] = None,
+        python: Optional[VersionFilter] = None,
+        variation: Optional[VariationFilter] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize selector.
+
+        Parameters
+        ----------
+        poetry : Optional[VersionFilter], optional
+            Filter of Poetry versions, by default None
+        python : Optional[VersionFilter], optional
+            Filter of Python versions, by default None
+        variation : Optional[VariationFilter], optional
+            Filter of Python Oficial Image variations, by default None
+        source : Optional[str], optional
+            Text the selector was parsed from, by default None
+
+        """
+        self.poetry = poetry
+        self.python = python
+        self.variation = variation
+        self.source = source
+
+    def targets(self, patches: bool = False) -> Iterator[BuildTarget]:
+        """
+        Iterate over selected build targets of the versions matrix.
+
+        Parameters
+        ----------
+        patches : bool, optional
+            Iterate over all patches, instead of only the highest patch of
+            each minor, by default False
+
+        Returns
+        -------
+        Iterator[BuildTarget]
+            Selected build targets, ordered by Poetry, Python and variation.
+
+        """
+        return iter_build_targets(
+            patches=patches,
+            poetry=self.poetry,
+            python=self.python,
+            variation=self.variation,
+        )
+
+
+def compare_version(
+    comparison: str, expected: Version
+) -> Callable[[Version], bool]:
+    """
+    Get check of version against expected version.
+
+    Versions are compared with the precision of the expected version, so
+    python=3.11 matches all 3.11 patches. The ~= comparison follows the
+    compatible release clause: poetry~=1.4 is >=1.4 and <2.0.
+
+    Parameters
+    ----------
+    comparison : str
+        Comparison operator.
+    expected : Version
+        Version to compare with.
+
+    Returns
+    -------
+    Callable[[Version], bool]
+        Check of version.
+
+    """
+    size = len(expected)
+    if comparison == "~=":
+        prefix = expected[:-1]
+        return lambda version: (
+            version[:size] >= expected and version[: size - 1] == prefix
+        )
+    compare = VERSION_OPERATORS[comparison]
+    return lambda version: compare(version[:size], expected)
+
+
+def combine_version_checks(
+    checks: List[Callable[[Version], bool]]
+) -> Optional[VersionFilter]:
+    """
+    Combine version checks in a filter of Major and Minor and Patch versions.
+
+    Parameters
+    ----------
+    checks : List[Callable[[Version], bool]]
+        Checks that must all pass.
+
+    Returns
+    -------
+    Optional[VersionFilter]
+        Filter of versions; None, if there are no checks.
+
+    """
+    if not checks:
+        return None
+
+    def version_filter(minor_version: str, patch: int) -> bool:
+        version = (*map(int, minor_version.split(".")), patch)
+        return all(check(version) for check in checks)
+
+    return version_filter
+
+
+def match_variation(
+    comparison: str, names: FrozenSet[str]
+) -> Callable[[str], bool]:
+    """
+    Get check of Python variation against expected variations.
+
+    Parameters
+    ----------
+    comparison : str
+        Comparison operator.
+    names : FrozenSet[str]
+        Python Oficial Image variations to compare with.
+
+    Returns
+    -------
+    Callable[[str], bool]
+        Check of Python variation.
+
+    """
+    if comparison == "!=":
+        return lambda name: name not in names
+    return lambda name: name in names
+
+
+def get_matrix_versions(software: str) -> List[Version]:
+    """
+    Get versions of software in the versions matrix.
+
+    Parameters
+    ----------
+    software : str
+        Name of the software, poetry or python.
+
+    Returns
+    -------
+    List[Version]
+        Major, Minor and Patch numbers of each version of the software.
+
+    """
+    matrix = get_version_matrix()
+    index = (
+        matrix.poetry_index if software == "poetry" else matrix.python_index
+    )
+    return [(*map(int, minor.split(".")), patch) for minor, patch in index]
+
+
+def parse_selector(selector: str) -> Selector:
+    """
+    Parse selector of versions matrix build targets.
+
+    The selector is a comma separated list of clauses, all of which must
+    match. For example: poetry>=1.4,python~=3.11,variation=slim-bullseye
+
+    Version clauses accept the ~=, ==, =, !=, >=, <=, > and < operators.
+    Variation clauses accept the =, == and != operators, and alternatives
+    separated by |. Each clause must match the versions matrix, so a
+    mistyped value is reported instead of selecting no build targets.
+
+    Parameters
+    ----------
+    selector : str
+        Selector to parse.
+
+    Returns
+    -------
+    Selector
+        Filters of the selector.
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If selector is invalid or a clause matches nothing in the versions
+        matrix.
+
+    """
+    checks: Dict[str, List[Callable[[Version], bool]]] = {
+        "poetry": [],
+        "python": [],
+    }
+    variations: List[Callable[[str], bool]] = []
+    for clause in selector.split(","):
+        match = CLAUSE_PATTERN.match(clause)
+        if not match:
+            raise argparse.ArgumentTypeError(f"invalid clause {clause!r}")
+        field, comparison, value = match.groups()
+        if field == "variation":
+            if comparison not in ("=", "==", "!="):
+                raise argparse.ArgumentTypeError(
+                    f"invalid variation operator in {clause!r}"
+                )
+            names = frozenset(value.split("|"))
+            unknown = names.difference(get_version_matrix().variations)
+            if unknown:
+                raise argparse.ArgumentTypeError(
+                    f"unknown variation {', '.join(sorted(unknown))} in "
+                    f"{clause!r}"
+                )
+            variations.append(match_variation(comparison, names))
+            continue
+        if not VERSION_PATTERN.match(value):
+            raise argparse.ArgumentTypeError(f"invalid version in {clause!r}")
+        check = compare_version(comparison, tuple(map(int, value.split("."))))
+        if not any(check(version) for version in get_matrix_versions(field)):
+            raise argparse.ArgumentTypeError(
+                f"no {field} version in the versions matrix matches "
+                f"{clause!r}"
+            )
+        checks[field].append(check)
+    return Selector(
+        poetry=combine_version_checks(checks["poetry"]),
+        python=combine_version_checks(checks["python"]),
+        variation=(
+            (lambda name: all(check(name) for check in variations))
+            if variations
+            else None
+        ),
+        source=selector,
+    )
@@ -0,0 +1,129 @@
+"""Packing of pipeline jobs into balanced shards."""
+
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def pack_costs(costs: List[float], shards: int) -> List[List[int]]:
+    """
+    Pack costs into shards, balancing the total cost of each shard.
+
+    Uses the longest processing time rule: costs are assigned, highest
+    first, to the shard with the lowest total so far. Shards are ordered by
+    total cost, highest first, so the critical path starts first when
+    runners are limited.
+
+    Parameters
+    ----------
+    costs : List[float]
+        Cost of each item.
+    shards : int
+        Number of shards.
+
+    Returns
+    -------
+    List[List[int]]
+        Indexes of the items of each shard, highest cost first. Empty shards
+        are dropped.
+
+    """
+    heap: List[Tuple[float, int]] = [(0.0, shard) for shard in range(shards)]
+    packed: List[List[int]] = [[] for _ in range(shards)]
+    for index in order_by_cost(costs):
+        total, shard = heapq.heappop(heap)
+        packed[shard].append(index)
+        heapq.heappush(heap, (total + costs[index], shard))
+    return sorted(
+        (indexes for indexes in packed if indexes),
+        key=lambda indexes: -sum(costs[index] for index in indexes),
+    )
+
+
+def order_by_cost(costs: List[float]) -> List[int]:
+    """
+    Order items by cost, highest first.
+
+    Parameters
+    ----------
+    costs : List[float]
+        Cost of each item.
+
+    Returns
+    -------
+    List[int]
+        Indexes of the items; items of equal cost keep their order.
+
+    """
+    return sorted(range(len(costs)), key=lambda index: -costs[index])
+
+
+def get_shard_count(
+    jobs: int, shards: Optional[int] = None, max_jobs: Optional[int] = None
+) -> Optional[int]:
+    """
+    Get number of shards to pack jobs into.
+
+    Parameters
+    ----------
+    jobs : int
+        Number of jobs.
+    shards : Optional[int], optional
+        Number of shards, by default None
+    max_jobs : Optional[int], optional
+        Maximum number of matrix jobs, by default None
+
+    Returns
+    -------
+    Optional[int]
+        Number of shards; None, if jobs must not be sharded.
+
+    """
+    if shards:
+        return min(shards, jobs) or 1
+    if max_jobs and jobs > max_jobs:
+        return max_jobs
+    return None
+
+
+def shard_jobs(
+    jobs: List[Dict[str, str]], packed: List[List[int]]
+) -> List[Dict[str, Any]]:
+    """
+    Get shard jobs of packed jobs.
+
+    Parameters
+    ----------
+    jobs : List[Dict[str, str]]
+        Jobs to pack.
+    packed : List[List[int]]
+        Indexes of the jobs of each shard.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Shard number and jobs, longest first, of each shard job.
+
+    """
+    return [
+        {"shard": str(number), "jobs": [jobs[index] for index in indexes]}
+        for number, indexes in enumerate(packed, start=1)
+    ]
+
+
+def unshard_jobs(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Get jobs of matrix entries, unpacking shard jobs.
+
+    Parameters
+    ----------
+    entries : List[Dict[str, Any]]
+        Matrix entries, either jobs or shard jobs (as packed by --shards,
+        --max-jobs or --pack-by-base).
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Jobs of the entries, in matrix order.
+
+    """
+    return [job for entry in entries for job in entry.get("jobs", [entry])]
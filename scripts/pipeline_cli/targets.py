@@ -0,0 +1,215 @@
+"""Build targets of project's versions matrix."""
+
+import re
+from typing import Callable, Iterator, List, Optional
+
+from .matrix import VersionMatrix, get_version_matrix
+
+VERSION_PATTERN = re.compile(
+    r"^(\d+(?:\.\d+)*)\.(\d+)-python(\d+(?:\.\d+)*)\.(\d+)-(.+)$"
+)
+
+VersionFilter = Callable[[str, int], bool]
+VariationFilter = Callable[[str], bool]
+
+
+class BuildTarget:
+    """Docker Image of the versions matrix."""
+
+    __slots__ = (
+        "matrix",
+        "poetry_minor",
+        "poetry_patch",
+        "python_minor",
+        "python_patch",
+        "variation",
+    )
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        matrix: VersionMatrix,
+        poetry_minor: str,
+        poetry_patch: int,
+        python_minor: str,
+        python_patch: int,
+        variation: str,
+    ) -> None:
+        """
+        Initialize build target.
+
+        Parameters
+        ----------
+        matrix : VersionMatrix
+            Versions matrix of the target.
+        poetry_minor : str
+            Major and Minor version of Poetry.
+        poetry_patch : int
+            Patch version of Poetry
+        python_minor : str
+            Major and Minor version of Python
+        python_patch : int
+            Patch version of Python
+        variation : str
+            Python Oficial Image variation (for example, bullseye).
+
+        """
+        self.matrix = matrix
+        self.poetry_minor = poetry_minor
+        self.poetry_patch = poetry_patch
+        self.python_minor = python_minor
+        self.python_patch = python_patch
+        self.variation = variation
+
+    @property
+    def poetry_version(self) -> str:
+        """Poetry version in format major.minor.patch."""
+        return f"{self.poetry_minor}.{self.poetry_patch}"
+
+    @property
+    def python_version(self) -> str:
+        """Python version in format major.minor.patch."""
+        return f"{self.python_minor}.{self.python_patch}"
+
+    @property
+    def version(self) -> str:
+        """Full version of the Image."""
+        return (
+            f"{self.poetry_version}-python{self.python_version}-"
+            f"{self.variation}"
+        )
+
+    @property
+    def folder(self) -> str:
+        """Folder of the Dockerfile, relative to project root."""
+        return (
+            f"{self.poetry_minor}/python{self.python_minor}-{self.variation}"
+        )
+
+    @property
+    def dockerfile(self) -> str:
+        """Path of the Dockerfile, relative to project root."""
+        return f"{self.folder}/Dockerfile"
+
+    @property
+    def tags(self) -> List[str]:
+        """Sorted tag names of the Image."""
+        return self.matrix.tag_names(
+            self.poetry_minor,
+            self.poetry_patch,
+            self.python_minor,
+            self.python_patch,
+            self.variation,
+        )
+
+
+def parse_build_target(
+    version: str, matrix: Optional[VersionMatrix] = None
+) -> BuildTarget:
+    """
+    Parse build target of Image version.
+
+    Parameters
+    ----------
+    version : str
+        Full version of the Image, in format
+        POETRY_VERSION-pythonPYTHON_VERSION-PYTHON_VARIATION.
+    matrix : Optional[VersionMatrix], optional
+        Versions matrix, by default project's versions matrix.
+
+    Returns
+    -------
+    BuildTarget
+        Build target of the Image.
+
+    Raises
+    ------
+    ValueError
+        If version is not in the versions matrix.
+
+    """
+    matrix = matrix or get_version_matrix()
+    match = VERSION_PATTERN.match(version)
+    if not match:
+        raise ValueError(f"version {version} is not in the versions matrix")
+    (
+        poetry_minor,
+        poetry_patch,
+        python_minor,
+        python_patch,
+        variation,
+    ) = match.groups()
+    if (
+        (poetry_minor, int(poetry_patch)) not in matrix.poetry_index
+        or (python_minor, int(python_patch)) not in matrix.python_index
+        or variation not in matrix.variations
+    ):
+        raise ValueError(f"version {version} is not in the versions matrix")
+    return BuildTarget(
+        matrix,
+        poetry_minor,
+        int(poetry_patch),
+        python_minor,
+        int(python_patch),
+        variation,
+    )
+
+
+def iter_build_targets(
+    patches: bool = False,
+    poetry: Optional[VersionFilter] = None,
+    python: Optional[VersionFilter] = None,
+    variation: Optional[VariationFilter] = None,
+    matrix: Optional[VersionMatrix] = None,
+) -> Iterator[BuildTarget]:
+    """
+    Iterate over build targets of the versions matrix.
+
+    Filters are checked in the outer loops, so a rejected Poetry version
+    skips all its Python versions and variations.
+
+    Parameters
+    ----------
+    patches : bool, optional
+        Iterate over all patches, instead of only the highest patch of each
+        minor (the Dockerfiles tracked by version control), by default False
+    poetry : Optional[VersionFilter], optional
+        Filter of Poetry Major and Minor and Patch versions, by default None
+    python : Optional[VersionFilter], optional
+        Filter of Python Major and Minor and Patch versions, by default None
+    variation : Optional[VariationFilter], optional
+        Filter of Python Oficial Image variations, by default None
+    matrix : Optional[VersionMatrix], optional
+        Versions matrix, by default project's versions matrix.
+
+    Yields
+    ------
+    Iterator[BuildTarget]
+        Build targets, ordered by Poetry, Python and variation.
+
+    """
+    matrix = matrix or get_version_matrix()
+    if patches:
+        poetry_pairs = list(matrix.poetry_index)
+        python_pairs = list(matrix.python_index)
+    else:
+        poetry_pairs = list(matrix.poetry_highest.items())
+        python_pairs = list(matrix.python_highest.items())
+    if python:
+        python_pairs = [pair for pair in python_pairs if python(*pair)]
+    variations = [
+        name for name in matrix.variations if not variation or variation(name)
+    ]
+    for poetry_minor, poetry_patch in poetry_pairs:
+        if poetry and not poetry(poetry_minor, poetry_patch):
+            continue
+        for python_minor, python_patch in python_pairs:
+            for name in variations:
+                yield BuildTarget(
+                    matrix,
+                    poetry_minor,
+                    poetry_patch,
+                    python_minor,
+                    python_patch,
+                    name,
+                )
@@ -0,0 +1,343 @@
+"""Compiled Dockerfile templates."""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import FRAGMENT_FOLDER, TEMPLATE_FOLDER, TEMPLATE_PLACEHOLDERS
+
+TAG_PATTERN = re.compile(r"{{\s*(>?)\s*([\w.-]+)\s*}}")
+
+
+class TemplateError(Exception):
+    """Error raised when a template can not be compiled or rendered."""
+
+
+class CompiledTemplate:  # pylint: disable=too-few-public-methods
+    """Template parsed into literal and placeholder segments."""
+
+    __slots__ = ("path", "source_digest", "digest", "parts", "slots", "files")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: Path,
+        source_digest: str,
+        digest: str,
+        parts: List[str],
+        slots: Tuple[Tuple[int, str], ...],
+        files: Tuple[Path, ...],
+    ) -> None:
+        """
+        Initialize compiled template.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the template file.
+        source_digest : str
+            Hash of the template file.
+        digest : str
+            Hash of the template file and all its included fragments.
+        parts : List[str]
+            Literal segments, with empty strings where placeholders go.
+        slots : Tuple[Tuple[int, str], ...]
+            Index in parts and name of each placeholder.
+        files : Tuple[Path, ...]
+            Template file and all its included fragments.
+
+        """
+        self.path = path
+        self.source_digest = source_digest
+        self.digest = digest
+        self.parts = parts
+        self.slots = slots
+        self.files = files
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Render template with placeholders values.
+
+        Parameters
+        ----------
+        values : Dict[str, str]
+            Value of each placeholder.
+
+        Returns
+        -------
+        str
+            Rendered template.
+
+        Raises
+        ------
+        TemplateError
+            If a placeholder value is missing.
+
+        """
+        parts = self.parts.copy()
+        try:
+            for index, name in self.slots:
+                parts[index] = values[name]
+        except KeyError as error:
+            raise TemplateError(
+                f"{self.path.name}: missing value for placeholder {error}"
+            ) from error
+        return "".join(parts)
+
+
+def get_template_path(variation: str) -> Path:
+    """
+    Get path of Dockerfile template of Python variation.
+
+    Parameters
+    ----------
+    variation : str
+        Python Oficial Image variation (for example, bullseye).
+
+    Returns
+    -------
+    Path
+        Path of the Dockerfile template.
+
+    """
+    return TEMPLATE_FOLDER / f"Dockerfile-{variation}.template"
+
+
+def parse_template(
+    path: Path,
+    data: str,
+    segments: List[Tuple[bool, str]],
+    sources: Dict[Path, bytes],
+) -> None:
+    """
+    Parse template data into literal and placeholder segments.
+
+    Fragments included with ``{{> name}}`` are parsed in place, from
+    ``templates/fragments/name.template`` without its last line break.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the template file being parsed.
+    data : str
+        Template data.
+    segments : List[Tuple[bool, str]]
+        Parsed segments, where each item is a flag telling if it is a
+        placeholder and its literal text or placeholder name.
+    sources : Dict[Path, bytes]
+        Data of the files being parsed, in inclusion order.
+
+    Raises
+    ------
+    TemplateError
+        If template has unknown placeholders, missing fragments or fragments
+        included more than once.
+
+    """
+    position = 0
+    for match in TAG_PATTERN.finditer(data):
+        start, end = match.span()
+        segments.append((False, data[position:start]))
+        position = end
+        is_include, name = match.groups()
+        if not is_include:
+            if name not in TEMPLATE_PLACEHOLDERS:
+                raise TemplateError(
+                    f"{path.name}: unknown placeholder {{{{{name}}}}}"
+                )
+            segments.append((True, name))
+            continue
+        fragment_path = FRAGMENT_FOLDER / f"{name}.template"
+        if fragment_path in sources:
+            raise TemplateError(f"{path.name}: fragment {name} included twice")
+        try:
+            sources[fragment_path] = fragment_path.read_bytes()
+        except OSError as error:
+            raise TemplateError(
+                f"{path.name}: fragment {name} not found"
+            ) from error
+        fragment = sources[fragment_path].decode("utf-8")
+        parse_template(
+            fragment_path,
+            fragment[:-1] if fragment.endswith("\n") else fragment,
+            segments,
+            sources,
+        )
+    segments.append((False, data[position:]))
+
+
+def compile_template(path: Path, data: bytes) -> CompiledTemplate:
+    """
+    Compile template data.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the template file.
+    data : bytes
+        Template file data.
+
+    Returns
+    -------
+    CompiledTemplate
+        Compiled template.
+
+    Raises
+    ------
+    TemplateError
+        If template has malformed tags, is invalid or does not use all
+        placeholders.
+
+    """
+    segments: List[Tuple[bool, str]] = []
+    sources = {path: data}
+    parse_template(path, data.decode("utf-8"), segments, sources)
+    for is_placeholder, text in segments:
+        if not is_placeholder and ("{{" in text or "}}" in text):
+            raise TemplateError(f"{path.name}: malformed tag in {text!r}")
+
+    parts: List[str] = []
+    slots: List[Tuple[int, str]] = []
+    last_is_literal = False
+    for is_placeholder, text in segments:
+        if is_placeholder:
+            slots.append((len(parts), text))
+            parts.append("")
+        elif last_is_literal:
+            parts[-1] += text
+        else:
+            parts.append(text)
+        last_is_literal = not is_placeholder
+
+    missing = TEMPLATE_PLACEHOLDERS - {name for _, name in slots}
+    if missing:
+        raise TemplateError(
+            f"{path.name}: missing placeholders "
+            + ", ".join(f"{{{{{name}}}}}" for name in sorted(missing))
+        )
+
+    digest = hashlib.sha256()
+    for source in sources.values():
+        digest.update(source)
+    return CompiledTemplate(
+        path=path,
+        source_digest=hashlib.sha256(data).hexdigest(),
+        digest=digest.hexdigest(),
+        parts=parts,
+        slots=tuple(slots),
+        files=tuple(sources),
+    )
+
+
+FileStamps = Tuple[Tuple[int, int], ...]
+
+_CACHE: Dict[Path, Tuple[CompiledTemplate, FileStamps]] = {}
+
+
+def get_file_stamps(files: Tuple[Path, ...]) -> Optional[FileStamps]:
+    """
+    Get modification time and size of files.
+
+    Parameters
+    ----------
+    files : Tuple[Path, ...]
+        Paths of the files.
+
+    Returns
+    -------
+    Optional[FileStamps]
+        Modification time (in nanoseconds) and size of each file; None, if a
+        file can not be accessed.
+
+    """
+    try:
+        return tuple(
+            (stat.st_mtime_ns, stat.st_size)
+            for stat in (path.stat() for path in files)
+        )
+    except OSError:
+        return None
+
+
+def load_template(
+    variation: str, path: Optional[Path] = None
+) -> CompiledTemplate:
+    """
+    Load compiled template, compiling it only if one of its files changed.
+
+    The template file and its included fragments are read only when their
+    modification time or size differs from the ones of the cached compiled
+    template, so loading an unchanged template only checks its files stats.
+
+    Parameters
+    ----------
+    variation : str
+        Python Oficial Image variation (for example, bullseye).
+    path : Optional[Path], optional
+        Path of the template file, by default the variation's template.
+
+    Returns
+    -------
+    CompiledTemplate
+        Compiled template.
+
+    """
+    path = path or get_template_path(variation)
+    if path in _CACHE:
+        template, stamps = _CACHE[path]
+        if get_file_stamps(template.files) == stamps:
+            return template
+        del _CACHE[path]
+    template = compile_template(path, path.read_bytes())
+    file_stamps = get_file_stamps(template.files)
+    if file_stamps is not None:
+        _CACHE[path] = (template, file_stamps)
+    return template
+
+
+def render_dockerfile(
+    variation: str,
+    python_version: str,
+    poetry_version: str,
+) -> str:
+    """
+    Render Dockerfile given Python variation and Python and Poetry versions.
+
+    Parameters
+    ----------
+    variation : str
+        Python Oficial Image variation (for example, bullseye).
+    python_version : str
+        Python version.
+    poetry_version : str
+        Poetry version.
+
+    Returns
+    -------
+    str
+        Dockerfile file data.
+
+    """
+    return load_template(variation).render(
+        {"PYTHON_VERSION": python_version, "POETRY_VERSION": poetry_version}
+    )
+
+
+def invalidate_template(path: Path) -> None:
+    """
+    Remove compiled templates that include file from cache.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the changed template or fragment file.
+
+    """
+    for template_path, (template, _) in list(_CACHE.items()):
+        if path in template.files:
+            del _CACHE[template_path]
+
+
+def clear_cache() -> None:
+    """Clear compiled templates cache."""
+    _CACHE.clear()
@@ -0,0 +1,142 @@
+"""Build durations of project's Images."""
+
+import json
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+from .config import TIMINGS_HISTORY, VARIATION_WEIGHTS
+from .targets import parse_build_target
+
+Timings = Dict[str, float]
+
+
+def read_timings(path: Path) -> Timings:
+    """
+    Read build durations file.
+
+    Each line of the file is a JSON object with the version of an Image and
+    the seconds its build took. The duration of each version is the median
+    of its last TIMINGS_HISTORY builds.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the build durations file.
+
+    Returns
+    -------
+    Timings
+        Build seconds of each Image version.
+
+    Raises
+    ------
+    ValueError
+        If a line is not a valid build duration.
+
+    """
+    history: Dict[str, List[float]] = {}
+    with path.open(encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                history.setdefault(str(entry["version"]), []).append(
+                    float(entry["seconds"])
+                )
+            except (ValueError, KeyError, TypeError) as error:
+                raise ValueError(
+                    f"{path.name}:{number}: invalid build duration"
+                ) from error
+    return {
+        version: statistics.median(durations[-TIMINGS_HISTORY:])
+        for version, durations in history.items()
+    }
+
+
+def record_timing(path: Path, version: str, seconds: float) -> None:
+    """
+    Append build duration of Image version to build durations file.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the build durations file.
+    version : str
+        Full version of the Image.
+    seconds : float
+        Seconds the build took.
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open(mode="a", encoding="utf-8") as file:
+        file.write(
+            json.dumps({"version": version, "seconds": round(seconds, 3)})
+            + "\n"
+        )
+
+
+def get_variation(version: str) -> str:
+    """
+    Get Python Oficial Image variation of Image version.
+
+    Parameters
+    ----------
+    version : str
+        Full version of the Image, in format
+        POETRY_VERSION-pythonPYTHON_VERSION-PYTHON_VARIATION.
+
+    Returns
+    -------
+    str
+        Python Oficial Image variation (for example, bullseye).
+
+    Raises
+    ------
+    ValueError
+        If version is not in the versions matrix.
+
+    """
+    return parse_build_target(version).variation
+
+
+def get_job_costs(jobs: List[Dict[str, str]], timings: Timings) -> List[float]:
+    """
+    Get expected cost of each job.
+
+    Jobs with a recorded build duration cost its seconds. Other jobs cost
+    the weight of their variation, scaled to seconds by the ratio of
+    recorded durations to weights of the timed jobs.
+
+    Parameters
+    ----------
+    jobs : List[Dict[str, str]]
+        Jobs with the version of their Image.
+    timings : Timings
+        Build seconds of each Image version.
+
+    Returns
+    -------
+    List[float]
+        Cost of each job, in the jobs order.
+
+    """
+    weights = [
+        VARIATION_WEIGHTS.get(get_variation(job["version"]), 1.0)
+        for job in jobs
+    ]
+    timed = [
+        (timings[job["version"]], weight)
+        for job, weight in zip(jobs, weights)
+        if job["version"] in timings
+    ]
+    scale = 1.0
+    if timed and sum(weight for _, weight in timed):
+        scale = sum(seconds for seconds, _ in timed) / sum(
+            weight for _, weight in timed
+        )
+    return [
+        timings.get(job["version"], weight * scale)
+        for job, weight in zip(jobs, weights)
+    ]
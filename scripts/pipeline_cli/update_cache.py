@@ -0,0 +1,171 @@
+"""On-disk cache of update checks requests."""
+
+import json
+from email.message import Message
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .files import atomic_write, get_hash
+from .http_client import HTTPClient, HTTPError
+from .versions import parse_release
+
+
+class UpdateCache:
+    """Validators and release tags of tag pages, and last seen releases."""
+
+    __slots__ = ("path", "pages", "cursor")
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize update cache, reading it from path if it exists.
+
+        Parameters
+        ----------
+        path : Path
+            Path of the cache file.
+
+        """
+        self.path = path
+        try:
+            data = json.loads(path.read_text())
+            self.pages: Dict[str, Dict[str, Any]] = dict(data["pages"])
+            self.cursor: Dict[str, Any] = dict(data["cursor"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.pages = {}
+            self.cursor = {}
+
+    def get_headers(self, url: str) -> Dict[str, str]:
+        """
+        Get conditional request headers of page.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+
+        Returns
+        -------
+        Dict[str, str]
+            If-None-Match and If-Modified-Since headers, from the validators
+            of the cached page.
+
+        """
+        page = self.pages.get(url, {})
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    def store_page(
+        self,
+        url: str,
+        headers: Message,
+        tags: List[str],
+        next_url: Optional[str],
+    ) -> None:
+        """
+        Store page, if it has validators.
+
+        Only release tags are stored, as they are all update checks use.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        headers : Message
+            Response headers of the page.
+        tags : List[str]
+            Tags of the page.
+        next_url : Optional[str]
+            URL of the next page.
+
+        """
+        if not headers.get("ETag") and not headers.get("Last-Modified"):
+            self.pages.pop(url, None)
+            return
+        self.pages[url] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "tags": [tag for tag in tags if parse_release(tag)],
+            "next": next_url,
+        }
+
+    def get_seen_tags(self, config_data: bytes) -> Set[str]:
+        """
+        Get release tags seen by the last successful update check.
+
+        Parameters
+        ----------
+        config_data : bytes
+            Current data of project's config file.
+
+        Returns
+        -------
+        Set[str]
+            Seen release tags; empty, if config changed since that check.
+
+        """
+        if self.cursor.get("config") != get_hash(config_data):
+            return set()
+        return set(self.cursor.get("tags", []))
+
+    def store_seen_tags(self, config_data: bytes, tags: Set[str]) -> None:
+        """
+        Store release tags seen by a successful update check.
+
+        Parameters
+        ----------
+        config_data : bytes
+            Data of project's config file after the check.
+        tags : Set[str]
+            Seen release tags.
+
+        """
+        self.cursor = {"config": get_hash(config_data), "tags": sorted(tags)}
+
+    def save(self) -> None:
+        """Write update cache to its file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(
+            self.path,
+            json.dumps({"pages": self.pages, "cursor": self.cursor}).encode(),
+        )
+
+
+def open_page(
+    client: HTTPClient,
+    url: str,
+    headers: Dict[str, str],
+    cache: Optional[UpdateCache] = None,
+) -> Optional[Tuple[Any, Message]]:
+    """
+    Request JSON page, conditionally if it is cached.
+
+    Parameters
+    ----------
+    client : HTTPClient
+        Client sending the request.
+    url : str
+        URL of the page.
+    headers : Dict[str, str]
+        Request headers.
+    cache : Optional[UpdateCache], optional
+        Cache of the page, by default None
+
+    Returns
+    -------
+    Optional[Tuple[Any, Message]]
+        Decoded page and response headers; None, if the cached page was not
+        modified.
+
+    """
+    if cache:
+        headers = {**headers, **cache.get_headers(url)}
+    response = client.get(url, headers)
+    if response.status == 304:
+        if cache and url in cache.pages:
+            return None
+        raise HTTPError(url, response.status, response.reason)
+    return response.json(), response.headers
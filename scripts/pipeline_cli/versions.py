@@ -0,0 +1,217 @@
+"""Sorted index of software release versions."""
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .matrix import minor_to_tuple
+
+RELEASE_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+FIELD_BITS = 21
+FIELD_LIMIT = 1 << FIELD_BITS
+
+Version = Tuple[int, int, int]
+
+
+def encode_version(major: int, minor: int, patch: int) -> int:
+    """
+    Encode version as a single integer, preserving version order.
+
+    Parameters
+    ----------
+    major : int
+        Major version.
+    minor : int
+        Minor version.
+    patch : int
+        Patch version.
+
+    Returns
+    -------
+    int
+        Encoded version.
+
+    """
+    return (major << 2 * FIELD_BITS) | (minor << FIELD_BITS) | patch
+
+
+def decode_version(value: int) -> Version:
+    """
+    Decode version encoded by encode_version.
+
+    Parameters
+    ----------
+    value : int
+        Encoded version.
+
+    Returns
+    -------
+    Version
+        Major, Minor and Patch versions.
+
+    """
+    mask = FIELD_LIMIT - 1
+    return (
+        value >> 2 * FIELD_BITS,
+        (value >> FIELD_BITS) & mask,
+        value & mask,
+    )
+
+
+def parse_release(tag: str) -> Optional[Version]:
+    """
+    Parse release version of tag.
+
+    Parameters
+    ----------
+    tag : str
+        Tag of the software.
+
+    Returns
+    -------
+    Optional[Version]
+        Major, Minor and Patch versions; None, if tag is not in format
+        major.minor.patch.
+
+    """
+    release = RELEASE_PATTERN.fullmatch(tag)
+    if not release:
+        return None
+    major, minor, patch = map(int, release.groups())
+    return major, minor, patch
+
+
+def get_oldest_version(versions: Dict[str, List[int]]) -> Version:
+    """
+    Get oldest project version of software.
+
+    Parameters
+    ----------
+    versions : Dict[str, List[int]]
+        Project versions of the software.
+
+    Returns
+    -------
+    Version
+        Lowest patch of the oldest Major and Minor version.
+
+    """
+    oldest = min(versions, key=minor_to_tuple)
+    major, minor = map(int, oldest.split(".", maxsplit=1))
+    return major, minor, min(versions[oldest])
+
+
+class VersionIndex:
+    """Sorted release versions of a software, stored as encoded integers."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Iterable[int]) -> None:
+        """
+        Initialize version index.
+
+        Parameters
+        ----------
+        values : Iterable[int]
+            Encoded versions.
+
+        """
+        self.values = array("Q", sorted(set(values)))
+
+    @classmethod
+    def from_tags(cls, tags: Iterable[str]) -> "VersionIndex":
+        """
+        Build version index from tags, in a single pass.
+
+        Only tags in format major.minor.patch are indexed, so pre-releases
+        and Image variations (for example, 3.11.4-slim) are skipped.
+
+        Parameters
+        ----------
+        tags : Iterable[str]
+            Tags of the software.
+
+        Returns
+        -------
+        VersionIndex
+            Index of the release versions.
+
+        """
+        match = RELEASE_PATTERN.fullmatch
+        values = set()
+        for tag in tags:
+            release = match(tag)
+            if not release:
+                continue
+            major, minor, patch = map(int, release.groups())
+            if max(major, minor, patch) < FIELD_LIMIT:
+                values.add(encode_version(major, minor, patch))
+        return cls(values)
+
+    def __len__(self) -> int:
+        """Get number of indexed versions."""
+        return len(self.values)
+
+    def between(
+        self, start: Version, stop: Optional[Version] = None
+    ) -> Iterator[Version]:
+        """
+        Iterate over indexed versions from start up to, not including, stop.
+
+        Parameters
+        ----------
+        start : Version
+            First version of the range.
+        stop : Optional[Version], optional
+            Version ending the range, by default the end of the index.
+
+        Yields
+        ------
+        Iterator[Version]
+            Versions in ascending order.
+
+        """
+        values = self.values
+        for index in range(
+            bisect_left(values, encode_version(*start)),
+            bisect_left(values, encode_version(*stop))
+            if stop
+            else len(values),
+        ):
+            yield decode_version(values[index])
+
+    def get_updates(self, versions: Dict[str, List[int]]) -> List[Version]:
+        """
+        Get indexed versions newer than the project versions.
+
+        These are the patches of each project Major and Minor version from its
+        lowest patch on that the project does not have, and all versions of
+        Major and Minor versions newer than the project ones.
+
+        Parameters
+        ----------
+        versions : Dict[str, List[int]]
+            Project versions of the software.
+
+        Returns
+        -------
+        List[Version]
+            Sorted available versions for update.
+
+        """
+        updates: List[Version] = []
+        newest = (0, 0)
+        for minor_version, patches in versions.items():
+            major, minor = map(int, minor_version.split(".", maxsplit=1))
+            newest = max(newest, (major, minor))
+            known = set(patches)
+            updates.extend(
+                version
+                for version in self.between(
+                    (major, minor, min(patches)), (major, minor + 1, 0)
+                )
+                if version[2] not in known
+            )
+        updates.extend(self.between((newest[0], newest[1] + 1, 0)))
+        return sorted(updates)
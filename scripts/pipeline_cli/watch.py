@@ -0,0 +1,239 @@
+"""Watch files for changes."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+DEBOUNCE_SECONDS = 0.1
+
+
+class Watcher(ABC):
+    """Base class of watchers of files in folders."""
+
+    def __init__(self, folders: List[Path]) -> None:
+        """
+        Initialize watcher.
+
+        Parameters
+        ----------
+        folders : List[Path]
+            Folders whose files are watched.
+
+        """
+        self.folders = folders
+
+    @abstractmethod
+    def wait(self) -> Set[Path]:
+        """
+        Wait for files to change.
+
+        Returns
+        -------
+        Set[Path]
+            Paths of the changed files.
+
+        """
+
+    def close(self) -> None:
+        """Release watcher resources."""
+
+
+class InotifyWatcher(Watcher):
+    """Watcher using Linux inotify."""
+
+    def __init__(self, folders: List[Path], libc: ctypes.CDLL) -> None:
+        """
+        Initialize inotify watcher.
+
+        Parameters
+        ----------
+        folders : List[Path]
+            Folders whose files are watched.
+        libc : ctypes.CDLL
+            C standard library with inotify functions.
+
+        Raises
+        ------
+        OSError
+            If inotify can not watch folders.
+
+        """
+        super().__init__(folders)
+        self.descriptor = libc.inotify_init1(IN_CLOEXEC)
+        if self.descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Path] = {}
+        for folder in folders:
+            watch = libc.inotify_add_watch(
+                self.descriptor, os.fsencode(folder), WATCH_MASK
+            )
+            if watch < 0:
+                os.close(self.descriptor)
+                raise OSError(ctypes.get_errno(), f"can not watch {folder}")
+            self.watches[watch] = folder
+
+    def read_events(self) -> Set[Path]:
+        """
+        Read pending inotify events.
+
+        Returns
+        -------
+        Set[Path]
+            Paths of the changed files.
+
+        """
+        changed = set()
+        data = os.read(self.descriptor, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            watch, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            start = offset + EVENT_HEADER.size
+            offset = start + length
+            name = data[start:offset].rstrip(b"\0")
+            if name and watch in self.watches:
+                changed.add(self.watches[watch] / os.fsdecode(name))
+        return changed
+
+    def wait(self) -> Set[Path]:
+        """
+        Wait for files to change.
+
+        Events arriving shortly after the first one are grouped, so an editor
+        saving a file in several steps triggers a single change.
+
+        Returns
+        -------
+        Set[Path]
+            Paths of the changed files.
+
+        """
+        select.select([self.descriptor], [], [])
+        changed = self.read_events()
+        while select.select([self.descriptor], [], [], DEBOUNCE_SECONDS)[0]:
+            changed |= self.read_events()
+        return changed
+
+    def close(self) -> None:
+        """Close inotify file descriptor."""
+        os.close(self.descriptor)
+
+
+class PollingWatcher(Watcher):
+    """Watcher comparing files modification times periodically."""
+
+    def __init__(self, folders: List[Path], interval: float = 1.0) -> None:
+        """
+        Initialize polling watcher.
+
+        Parameters
+        ----------
+        folders : List[Path]
+            Folders whose files are watched.
+        interval : float, optional
+            Seconds between checks, by default 1.0
+
+        """
+        super().__init__(folders)
+        self.interval = interval
+        self.stats = self.get_stats()
+
+    def get_stats(self) -> Dict[Path, int]:
+        """
+        Get modification time of watched files.
+
+        Returns
+        -------
+        Dict[Path, int]
+            Modification time, in nanoseconds, of each file.
+
+        """
+        stats = {}
+        for folder in self.folders:
+            for path in folder.iterdir():
+                try:
+                    stats[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return stats
+
+    def wait(self) -> Set[Path]:
+        """
+        Wait for files to change.
+
+        Returns
+        -------
+        Set[Path]
+            Paths of the changed files.
+
+        """
+        while True:
+            time.sleep(self.interval)
+            stats = self.get_stats()
+            changed = {
+                path
+                for path in stats.keys() | self.stats.keys()
+                if stats.get(path) != self.stats.get(path)
+            }
+            self.stats = stats
+            if changed:
+                return changed
+
+
+def get_libc() -> Optional[ctypes.CDLL]:
+    """
+    Get C standard library, if it has inotify functions.
+
+    Returns
+    -------
+    Optional[ctypes.CDLL]
+        C standard library; None, if inotify is not available.
+
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+def create_watcher(folders: List[Path]) -> Watcher:
+    """
+    Create inotify watcher, falling back to polling where not available.
+
+    Parameters
+    ----------
+    folders : List[Path]
+        Folders whose files are watched.
+
+    Returns
+    -------
+    Watcher
+        Watcher of files in folders.
+
+    """
+    libc = get_libc()
+    if libc:
+        try:
+            return InotifyWatcher(folders, libc)
+        except OSError:
+            pass
+    return PollingWatcher(folders)
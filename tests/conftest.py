@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0, (Path(__file__).resolve().parent.parent / "scripts").as_posix()
+)
@@ -0,0 +1,259 @@
+import hashlib
+import itertools
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Type,
+)
+from urllib import parse
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+
+
+Reply = Tuple[int, Dict[str, str], bytes]
+
+
+class StandIn:
+    """HTTP/1.1 keep-alive server answering requests in a thread."""
+
+    def __init__(self, handle: Callable[[Request], Reply]) -> None:
+        self.handle = handle
+        self.requests: List[Request] = []
+        self.connections = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                stand_in.connections += 1
+
+            def answer(self) -> None:
+                path, _, query = self.path.partition("?")
+                length = int(self.headers.get("Content-Length") or 0)
+                request = Request(
+                    method=self.command,
+                    path=path,
+                    query=dict(parse.parse_qsl(query)),
+                    headers={
+                        key.lower(): value
+                        for key, value in self.headers.items()
+                    },
+                    body=self.rfile.read(length),
+                )
+                stand_in.requests.append(request)
+                status, headers, body = stand_in.handle(request)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_HEAD = do_PUT = do_POST = answer
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+
+    def __enter__(self) -> "StandIn":
+        self.thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def get_digest(data: bytes) -> str:
+    return f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+
+class StandInRegistry:
+    """Docker registry API with bearer tokens, on a stand-in server."""
+
+    MANIFEST_PATTERN = re.compile(r"^/v2/(.+)/manifests/([^/]+)$")
+    BLOB_PATTERN = re.compile(r"^/v2/(.+)/blobs/([^/]+)$")
+    UPLOADS_PATTERN = re.compile(r"^/v2/(.+)/blobs/uploads/(\d*)$")
+    TAGS_PATTERN = re.compile(r"^/v2/(.+)/tags/list$")
+
+    def __init__(
+        self, token_expiry: int = 300, page_size: Optional[int] = None
+    ) -> None:
+        self.server = StandIn(self.handle)
+        self.url = self.server.url
+        self.requests = self.server.requests
+        self.token_expiry = token_expiry
+        self.page_size = page_size
+        self.tokens: List[str] = []
+        self.revoked: Set[str] = set()
+        self.manifests: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+        self.blobs: Dict[Tuple[str, str], bytes] = {}
+        self.tags: Dict[str, List[str]] = {}
+        self.uploads: Dict[str, str] = {}
+        self.counter = itertools.count()
+
+    def __enter__(self) -> "StandInRegistry":
+        self.server.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.server.__exit__(exc_type, exc, traceback)
+
+    def add_image(self, repository: str, tag: str) -> str:
+        """Add single platform Image, returning the digest of its index."""
+        blobs = [f"{repository}:{tag}:{index}".encode() for index in range(3)]
+        for blob in blobs:
+            self.blobs[(repository, get_digest(blob))] = blob
+        manifest = json.dumps(
+            {
+                "schemaVersion": 2,
+                "mediaType": "application/vnd.oci.image.manifest.v1+json",
+                "config": {"digest": get_digest(blobs[0])},
+                "layers": [{"digest": get_digest(blob)} for blob in blobs[1:]],
+            }
+        ).encode()
+        manifest_type = "application/vnd.oci.image.manifest.v1+json"
+        self.manifests[(repository, get_digest(manifest))] = (
+            manifest,
+            manifest_type,
+        )
+        index = json.dumps(
+            {
+                "schemaVersion": 2,
+                "mediaType": "application/vnd.oci.image.index.v1+json",
+                "manifests": [{"digest": get_digest(manifest)}],
+            }
+        ).encode()
+        index_type = "application/vnd.oci.image.index.v1+json"
+        self.manifests[(repository, tag)] = (index, index_type)
+        self.manifests[(repository, get_digest(index))] = (index, index_type)
+        return get_digest(index)
+
+    def is_authorized(self, request: Request) -> bool:
+        token = request.headers.get("authorization", "")[len("Bearer ") :]
+        return token in self.tokens and token not in self.revoked
+
+    def handle(self, request: Request) -> Reply:
+        if request.path == "/token":
+            token = f"token-{next(self.counter)}"
+            self.tokens.append(token)
+            body = {"token": token, "expires_in": self.token_expiry}
+            return 200, {}, json.dumps(body).encode()
+        if not self.is_authorized(request):
+            challenge = f'Bearer realm="{self.url}/token",service="stand-in"'
+            return 401, {"WWW-Authenticate": challenge}, b""
+        if request.path == "/v2/":
+            return 200, {}, b"{}"
+        routes: List[Tuple[Pattern[str], Callable[..., Reply]]] = [
+            (self.MANIFEST_PATTERN, self.handle_manifest),
+            (self.UPLOADS_PATTERN, self.handle_upload),
+            (self.BLOB_PATTERN, self.handle_blob),
+            (self.TAGS_PATTERN, self.handle_tags),
+        ]
+        for pattern, handle in routes:
+            match = pattern.match(request.path)
+            if match:
+                return handle(request, *match.groups())
+        return 404, {}, b""
+
+    def handle_manifest(
+        self, request: Request, repository: str, reference: str
+    ) -> Reply:
+        if request.method == "PUT":
+            media_type = request.headers["content-type"]
+            self.manifests[(repository, reference)] = (
+                request.body,
+                media_type,
+            )
+            self.manifests[(repository, get_digest(request.body))] = (
+                request.body,
+                media_type,
+            )
+            return 201, {}, b""
+        if (repository, reference) not in self.manifests:
+            return 404, {}, b""
+        data, media_type = self.manifests[(repository, reference)]
+        return 200, {"Content-Type": media_type}, data
+
+    def handle_blob(
+        self, request: Request, repository: str, digest: str
+    ) -> Reply:
+        if (repository, digest) not in self.blobs:
+            return 404, {}, b""
+        return 200, {}, self.blobs[(repository, digest)]
+
+    def handle_upload(
+        self, request: Request, repository: str, upload: str
+    ) -> Reply:
+        if request.method == "POST":
+            source = request.query.get("from")
+            digest = request.query.get("mount")
+            if source and digest and (source, digest) in self.blobs:
+                self.blobs[(repository, digest)] = self.blobs[(source, digest)]
+                return 201, {}, b""
+            upload = str(next(self.counter))
+            self.uploads[upload] = repository
+            location = f"/v2/{repository}/blobs/uploads/{upload}"
+            return 202, {"Location": location}, b""
+        digest = request.query["digest"]
+        if get_digest(request.body) != digest:
+            return 400, {}, b""
+        self.blobs[(self.uploads.pop(upload), digest)] = request.body
+        return 201, {}, b""
+
+    def handle_tags(self, request: Request, repository: str) -> Reply:
+        tags = self.tags.get(repository, [])
+        size = int(request.query.get("n") or len(tags) or 1)
+        if self.page_size:
+            size = min(size, self.page_size)
+        last = request.query.get("last")
+        start = tags.index(last) + 1 if last in tags else 0
+        page = tags[start : start + size]
+        headers = {"ETag": f'"{get_digest(json.dumps(page).encode())}"'}
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return 304, headers, b""
+        if start + size < len(tags):
+            query = parse.urlencode({"n": size, "last": page[-1]})
+            headers[
+                "Link"
+            ] = f'</v2/{repository}/tags/list?{query}>; rel="next"'
+        body = json.dumps({"name": repository, "tags": page}).encode()
+        return 200, {"Content-Type": "application/json", **headers}, body
@@ -0,0 +1,83 @@
+import re
+from typing import Any, Dict, List
+
+from pipeline_cli.bake import get_bake_file
+from pipeline_cli.commands.dockerfiles import load_templates, render_target
+from pipeline_cli.config import BAKE_CONTEXT_FOLDER
+from pipeline_cli.selector import Selector
+
+NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
+TAG_PATTERN = re.compile(r"^[a-z0-9]+(?:[._/-][a-z0-9]+)*:[\w][\w.-]{0,127}$")
+TARGET_FIELDS = {"context": str, "dockerfile-inline": str, "tags": list}
+COPY_PATTERN = re.compile(r"^\s*(COPY|ADD)\b(.*)$", re.MULTILINE)
+
+
+def validate_bake_file(bake_file: Dict[str, Any]) -> List[str]:
+    """Check Bake file against the subset of the Bake schema it uses."""
+    errors = [
+        f"unknown key {key!r}"
+        for key in sorted(set(bake_file) - {"group", "target"})
+    ]
+    targets = bake_file.get("target", {})
+    for name, target in targets.items():
+        if not NAME_PATTERN.match(name):
+            errors.append(f"invalid target name {name!r}")
+        for field in sorted(set(target) - set(TARGET_FIELDS)):
+            errors.append(f"target {name}: unknown field {field!r}")
+        for field, field_type in TARGET_FIELDS.items():
+            if not isinstance(target.get(field), field_type):
+                errors.append(f"target {name}: invalid field {field!r}")
+        if not target.get("tags"):
+            errors.append(f"target {name}: no tags")
+        errors.extend(
+            f"target {name}: invalid tag {tag!r}"
+            for tag in target.get("tags") or []
+            if not isinstance(tag, str) or not TAG_PATTERN.match(tag)
+        )
+    for name, group in bake_file.get("group", {}).items():
+        if not NAME_PATTERN.match(name):
+            errors.append(f"invalid group name {name!r}")
+        errors.extend(
+            f"group {name}: unknown target {member!r}"
+            for member in group.get("targets", [])
+            if member not in targets
+        )
+    return errors
+
+
+def get_project_bake_file() -> Dict[str, Any]:
+    templates = load_templates()
+    return get_bake_file(
+        list(Selector().targets(patches=True)),
+        lambda target: render_target(templates, target).decode("utf-8"),
+    )
+
+
+def test_bake_file_matches_schema() -> None:
+    bake_file = get_project_bake_file()
+
+    assert validate_bake_file(bake_file) == []
+    assert bake_file["group"]["default"]["targets"] == list(
+        bake_file["target"]
+    )
+
+
+def test_schema_reports_invalid_targets() -> None:
+    bake_file = {
+        "target": {"1.5.1": {"context": ".", "tags": ["Poetry:latest"]}},
+        "group": {"default": {"targets": ["missing"]}},
+    }
+
+    assert validate_bake_file(bake_file) == [
+        "invalid target name '1.5.1'",
+        "target 1.5.1: invalid field 'dockerfile-inline'",
+        "target 1.5.1: invalid tag 'Poetry:latest'",
+        "group default: unknown target 'missing'",
+    ]
+
+
+def test_targets_do_not_use_build_context() -> None:
+    for target in get_project_bake_file()["target"].values():
+        assert target["context"] == BAKE_CONTEXT_FOLDER.as_posix()
+        for _, arguments in COPY_PATTERN.findall(target["dockerfile-inline"]):
+            assert "--from=" in arguments
@@ -0,0 +1,75 @@
+import json
+from functools import partial
+from typing import Dict, List
+
+from pipeline_cli.commands.update import is_release_at_or_below
+from pipeline_cli.github import iter_github_tags
+from pipeline_cli.http_client import HTTPClient
+from pipeline_cli.versions import get_oldest_version
+from stand_in import Reply, Request, StandIn
+
+REPOSITORY = "python-poetry/poetry"
+PER_PAGE = 5
+TAGS = [
+    f"1.{minor}.{patch}{suffix}"
+    for minor in reversed(range(9))
+    for patch in reversed(range(3))
+    for suffix in ["", "rc1"]
+]
+
+
+def handle_tags(request: Request) -> Reply:
+    if request.path != f"/repos/{REPOSITORY}/tags":
+        return 404, {}, b""
+    page = int(request.query.get("page") or 1)
+    per_page = int(request.query["per_page"])
+    names = TAGS[(page - 1) * per_page : page * per_page]
+    headers = {"Content-Type": "application/json"}
+    if page * per_page < len(TAGS):
+        headers["Link"] = (
+            f"</repos/{REPOSITORY}/tags?per_page={per_page}"
+            f'&page={page + 1}>; rel="next"'
+        )
+    body = json.dumps([{"name": name} for name in names]).encode()
+    return 200, headers, body
+
+
+def list_tags(server: StandIn, versions: Dict[str, List[int]]) -> List[str]:
+    client = HTTPClient()
+    try:
+        return list(
+            iter_github_tags(
+                REPOSITORY,
+                stop=partial(
+                    is_release_at_or_below,
+                    version=get_oldest_version(versions),
+                ),
+                api_url=server.url,
+                per_page=PER_PAGE,
+                client=client,
+            )
+        )
+    finally:
+        client.close()
+
+
+def get_pages(server: StandIn) -> List[int]:
+    return [int(request.query.get("page") or 1) for request in server.requests]
+
+
+def test_stops_after_page_with_oldest_version() -> None:
+    with StandIn(handle_tags) as server:
+        tags = list_tags(server, {"1.5": [1, 2], "1.6": [0]})
+
+    oldest_page = TAGS.index("1.5.1") // PER_PAGE + 1
+    assert get_pages(server) == list(range(1, oldest_page + 1))
+    assert tags == TAGS[: oldest_page * PER_PAGE]
+    assert server.connections == 1
+
+
+def test_requests_all_pages_without_oldest_version() -> None:
+    with StandIn(handle_tags) as server:
+        tags = list_tags(server, {"0.12": [17]})
+
+    assert tags == TAGS
+    assert get_pages(server) == list(range(1, len(TAGS) // PER_PAGE + 2))
@@ -0,0 +1,123 @@
+from typing import Iterator, List
+
+from pipeline_cli.http_client import USER_AGENT, HTTPClient, HTTPError
+from pipeline_cli.registry import open_registry_page
+from stand_in import Reply, StandIn, StandInRegistry
+
+TAGS_PATH = "/v2/library/python/tags/list"
+
+
+def reply_in_order(statuses: List[int]) -> Iterator[Reply]:
+    for status in statuses:
+        yield status, {"Retry-After": "0"}, b"{}"
+    while True:
+        yield 200, {}, b'{"ok": true}'
+
+
+def test_sends_user_agent_unless_given() -> None:
+    client = HTTPClient()
+    with StandIn(lambda request: (200, {}, b"{}")) as server:
+        try:
+            client.get(f"{server.url}/default", {})
+            client.get(f"{server.url}/custom", {"User-Agent": "custom"})
+        finally:
+            client.close()
+
+    assert [request.headers["user-agent"] for request in server.requests] == [
+        USER_AGENT,
+        "custom",
+    ]
+    assert server.connections == 1
+
+
+def test_retries_rate_limits_and_server_errors() -> None:
+    replies = reply_in_order([429, 503, 502])
+    client = HTTPClient()
+    with StandIn(lambda request: next(replies)) as server:
+        try:
+            response = client.get(f"{server.url}/tags", {})
+        finally:
+            client.close()
+
+    assert response.json() == {"ok": True}
+    assert [
+        (timing.status, timing.attempt, timing.reused)
+        for timing in client.timings
+    ] == [(429, 0, False), (503, 1, True), (502, 2, True), (200, 3, True)]
+    assert len(server.requests) == 4
+
+
+def test_raises_after_last_retry() -> None:
+    replies = reply_in_order([503] * 3)
+    client = HTTPClient(retries=1)
+    with StandIn(lambda request: next(replies)) as server:
+        try:
+            client.get(f"{server.url}/tags", {})
+        except HTTPError as error:
+            assert error.status == 503
+        else:
+            raise AssertionError("HTTPError not raised")
+        finally:
+            client.close()
+
+    assert len(server.requests) == 2
+
+
+def count_token_requests(registry: StandInRegistry) -> int:
+    return [request.path for request in registry.requests].count("/token")
+
+
+def test_reuses_token_until_it_expires() -> None:
+    client = HTTPClient()
+    with StandInRegistry() as registry, StandInRegistry(
+        token_expiry=5
+    ) as expiring_registry:
+        try:
+            tokens = [
+                client.get_token(f"{registry.url}/token") for _ in range(3)
+            ]
+            expiring_tokens = [
+                client.get_token(f"{expiring_registry.url}/token")
+                for _ in range(2)
+            ]
+        finally:
+            client.close()
+
+    assert tokens == ["token-0"] * 3
+    assert count_token_requests(registry) == 1
+    assert expiring_tokens == ["token-0", "token-1"]
+    assert count_token_requests(expiring_registry) == 2
+
+
+def test_refreshes_rejected_token() -> None:
+    client = HTTPClient()
+    with StandInRegistry() as registry:
+        registry.tags["library/python"] = ["3.11.4"]
+        url = f"{registry.url}{TAGS_PATH}"
+        token_url = f"{registry.url}/token"
+        try:
+            first_page = open_registry_page(client, url, token_url)
+            registry.revoked.add("token-0")
+            second_page = open_registry_page(client, url, token_url)
+        finally:
+            client.close()
+
+    assert first_page and second_page
+    assert (
+        first_page[0]
+        == second_page[0]
+        == {
+            "name": "library/python",
+            "tags": ["3.11.4"],
+        }
+    )
+    assert registry.tokens == ["token-0", "token-1"]
+    assert [
+        (request.path, request.headers.get("authorization"))
+        for request in registry.requests
+        if request.path != "/token"
+    ] == [
+        (TAGS_PATH, "Bearer token-0"),
+        (TAGS_PATH, "Bearer token-0"),
+        (TAGS_PATH, "Bearer token-1"),
+    ]
@@ -0,0 +1,75 @@
+import io
+from contextlib import redirect_stdout
+from unittest import mock
+
+from pipeline_cli.commands import mirror
+from pipeline_cli.commands.cd_jobs import get_registry_tags
+from pipeline_cli.targets import parse_build_target
+from stand_in import StandInRegistry
+
+VERSIONS = ["1.5.1-python3.11.4-bullseye", "1.4.2-python3.10.12-slim-bullseye"]
+
+
+def test_mirror_copies_images_with_registry_tags() -> None:
+    output = io.StringIO()
+
+    with StandInRegistry() as origin, StandInRegistry() as other:
+        for version in VERSIONS:
+            origin.add_image("poetry", version)
+        origin_host = origin.url.split("://")[1]
+        other_host = other.url.split("://")[1]
+        registries = [
+            f"{origin_host}/poetry",
+            f"{origin_host}/mirror/poetry",
+            f"{other_host}/poetry",
+        ]
+        with mock.patch.object(
+            mirror, "IMAGE_REPOSITORY", registries[0]
+        ), mock.patch.object(mirror, "REGISTRIES", registries), mock.patch(
+            "pipeline_cli.commands.cd_jobs.REGISTRIES", registries
+        ), redirect_stdout(
+            output
+        ):
+            mirror.mirror(versions=VERSIONS)
+            registry_tags = [
+                get_registry_tags(parse_build_target(version))
+                for version in VERSIONS
+            ]
+
+    for version, tags in zip(VERSIONS, registry_tags):
+        source = origin.manifests[("poetry", version)]
+        for reference in tags[registries[1]]:
+            tag = reference.split(":")[-1]
+            assert origin.manifests[("mirror/poetry", tag)] == source
+        for reference in tags[registries[2]]:
+            tag = reference.split(":")[-1]
+            assert other.manifests[("poetry", tag)] == source
+    origin_blobs = {
+        digest for repository, digest in origin.blobs if repository == "poetry"
+    }
+    assert {
+        digest
+        for repository, digest in origin.blobs
+        if repository == "mirror/poetry"
+    } == origin_blobs
+    assert {digest for _, digest in other.blobs} == origin_blobs
+    mounts = [
+        (request.query.get("mount"), request.query.get("from"))
+        for request in origin.requests
+        if request.method == "POST"
+    ]
+    assert sorted(mounts) == [
+        (digest, "poetry") for digest in sorted(origin_blobs)
+    ]
+    assert not any(
+        request.method == "PUT" and "/blobs/uploads/" in request.path
+        for request in origin.requests
+    )
+    assert len(
+        [
+            request
+            for request in other.requests
+            if request.method == "PUT" and "/blobs/uploads/" in request.path
+        ]
+    ) == len(origin_blobs)
+    assert "Copied 2 Images to 2 registries (4 copies)." in output.getvalue()
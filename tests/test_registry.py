@@ -0,0 +1,80 @@
+import tempfile
+from pathlib import Path
+from typing import List
+
+from pipeline_cli.http_client import HTTPClient
+from pipeline_cli.registry import iter_registry_tags
+from pipeline_cli.update_cache import UpdateCache
+from stand_in import StandInRegistry
+
+REPOSITORY = "library/python"
+TAGS = [
+    f"3.{minor}.{patch}{suffix}"
+    for minor in range(8, 13)
+    for patch in range(4)
+    for suffix in ["", "-slim"]
+]
+
+
+def list_tags(
+    registry: StandInRegistry, page_size: int, cache: UpdateCache
+) -> List[str]:
+    client = HTTPClient()
+    try:
+        return list(
+            iter_registry_tags(
+                registry.url,
+                REPOSITORY,
+                token_url=f"{registry.url}/token",
+                page_size=page_size,
+                cache=cache,
+                client=client,
+            )
+        )
+    finally:
+        client.close()
+
+
+def get_page_requests(registry: StandInRegistry) -> List[str]:
+    return [
+        request.query.get("last", "")
+        for request in registry.requests
+        if request.path == f"/v2/{REPOSITORY}/tags/list"
+        and "authorization" in request.headers
+    ]
+
+
+def test_follows_link_pages_with_one_token() -> None:
+    with StandInRegistry(page_size=7) as registry:
+        registry.tags[REPOSITORY] = TAGS
+        with tempfile.TemporaryDirectory() as folder:
+            cache = UpdateCache(Path(folder) / "cache.json")
+            tags = list_tags(registry, 100, cache)
+
+    assert tags == TAGS
+    assert get_page_requests(registry) == [""] + TAGS[6:-1:7]
+    assert registry.tokens == ["token-0"]
+    assert [request.path for request in registry.requests].count("/token") == 1
+
+
+def test_reuses_not_modified_pages() -> None:
+    with StandInRegistry() as registry:
+        registry.tags[REPOSITORY] = TAGS
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "cache.json"
+            cache = UpdateCache(path)
+            assert list_tags(registry, 7, cache) == TAGS
+            cache.save()
+            start = len(registry.requests)
+            cached_tags = list_tags(registry, 7, UpdateCache(path))
+
+    pages = [
+        request
+        for request in registry.requests[start:]
+        if request.path.endswith("/tags/list")
+        and "authorization" in request.headers
+    ]
+    assert cached_tags == [tag for tag in TAGS if not tag.endswith("-slim")]
+    assert len(pages) == 6
+    assert all("if-none-match" in request.headers for request in pages)
+    assert len(registry.requests) - start == len(pages) + 1
@@ -0,0 +1,41 @@
+import io
+from contextlib import redirect_stdout
+from unittest import mock
+
+from pipeline_cli.commands import retag
+from pipeline_cli.fingerprint import Fingerprints
+from stand_in import StandInRegistry
+
+VERSION = "1.5.1-python3.11.4-bullseye"
+
+
+def test_retag_latest_only_puts_manifests() -> None:
+    image = {"version": VERSION, "fingerprint": "0" * 64}
+    published: Fingerprints = {VERSION: image}
+    current: Fingerprints = {VERSION: image, "latest": image}
+    output = io.StringIO()
+
+    with StandInRegistry() as registry, mock.patch.object(
+        retag, "read_fingerprints", return_value=published
+    ), mock.patch.object(
+        retag, "get_fingerprints", return_value=current
+    ), redirect_stdout(
+        output
+    ):
+        registry.add_image("poetry", VERSION)
+        host = registry.url.split("://")[1]
+        retag.retag(apply=True, repository=f"{host}/poetry")
+
+    assert registry.manifests[("poetry", "latest")] == (
+        registry.manifests[("poetry", VERSION)]
+    )
+    assert [
+        (request.method, request.path)
+        for request in registry.requests
+        if request.path.startswith("/v2/poetry/")
+    ] == [
+        ("GET", f"/v2/poetry/manifests/{VERSION}"),
+        ("PUT", "/v2/poetry/manifests/latest"),
+    ]
+    assert not any("/blobs/" in request.path for request in registry.requests)
+    assert "Retagged 1 published Images." in output.getvalue()
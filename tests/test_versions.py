@@ -0,0 +1,121 @@
+import random
+import time
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from pipeline_cli.commands.update import get_updates
+from pipeline_cli.versions import VersionIndex
+
+SUFFIXES = ["-slim", "-bullseye", "rc1", "a2", "b1", ".dev0"]
+
+
+def tag_str_to_tuple(version: str) -> Tuple[int, int]:
+    major, minor = version.split(".", maxsplit=1)
+    return int(major), int(minor)
+
+
+def patch_is_highest(patch: int, patches: List[int]) -> bool:
+    return patch >= min(patches)
+
+
+def get_updates_by_scan(
+    tags: List[str], versions: Dict[str, List[int]]
+) -> List[Tuple[int, int, int]]:
+    """Implementation replaced by VersionIndex, kept as the reference."""
+    tags_without_pre_releases = [
+        tag
+        for tag in tags
+        if len(tag.split(".", maxsplit=2)) == 3
+        and all(label.isdigit() for label in tag.split(".", maxsplit=2))
+    ]
+
+    tags_serialized: Dict[str, List[int]] = {}
+    for tag in tags_without_pre_releases:
+        major_and_minor, patch = tag.rsplit(".", maxsplit=1)
+        if tags_serialized.get(major_and_minor):
+            tags_serialized[major_and_minor].append(int(patch))
+        else:
+            tags_serialized[major_and_minor] = [int(patch)]
+
+    patch_updates = [
+        (*tag_str_to_tuple(version), patch)
+        for version, patches in versions.items()
+        for patch in filter(
+            partial(patch_is_highest, patches=patches),
+            tags_serialized[version],
+        )
+        if patch not in patches
+    ]
+
+    major_and_minor_updates = [
+        (*tag_str_to_tuple(tag), patch)
+        for tag, patches in tags_serialized.items()
+        for patch in patches
+        if tag_str_to_tuple(tag)
+        > max(tag_str_to_tuple(version) for version in versions)
+    ]
+
+    return sorted(patch_updates + major_and_minor_updates)
+
+
+def get_random_case(
+    rng: random.Random, size: int
+) -> Tuple[List[str], Dict[str, List[int]]]:
+    """Get unique tags and project versions whose Minors are all tagged."""
+    releases = {
+        (rng.randrange(4), rng.randrange(15), rng.randrange(30))
+        for _ in range(size)
+    }
+    minors = sorted({release[:2] for release in releases})
+    versions: Dict[str, List[int]] = {}
+    for major, minor in rng.sample(minors, k=rng.randint(1, len(minors))):
+        patches = sorted(
+            release[2] for release in releases if release[:2] == (major, minor)
+        )
+        versions[f"{major}.{minor}"] = rng.sample(
+            patches, k=rng.randint(1, len(patches))
+        )
+    tags = {".".join(map(str, release)) for release in releases}
+    tags.update(
+        f"{rng.choice(sorted(tags))}{rng.choice(SUFFIXES)}"
+        for _ in range(size // 4)
+    )
+    tags.update(f"{major}.{minor}" for major, minor in rng.sample(minors, k=1))
+    return rng.sample(sorted(tags), k=len(tags)), versions
+
+
+def test_get_updates_matches_scan() -> None:
+    rng = random.Random(0)
+    for _ in range(500):
+        tags, versions = get_random_case(rng, rng.randint(1, 80))
+        assert get_updates(tags, versions) == get_updates_by_scan(
+            tags, versions
+        )
+
+
+def test_get_updates_on_100k_tags_beats_scan() -> None:
+    tags = [
+        f"{major}.{minor}.{patch}{suffix}"
+        for major in range(4)
+        for minor in range(50)
+        for patch in range(100)
+        for suffix in ["", "-slim", "rc1", "-bullseye", "-alpine"]
+    ]
+    random.Random(1).shuffle(tags)
+    versions = {"3.8": [12, 13], "3.9": [10], "3.10": [40, 41]}
+
+    def best_time(
+        function: Callable[..., List[Tuple[int, int, int]]]
+    ) -> float:
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            updates = function(tags, versions)
+            timings.append(time.perf_counter() - start)
+        assert updates == expected
+        return min(timings)
+
+    expected = get_updates_by_scan(tags, versions)
+    assert len(tags) == 100_000
+    assert best_time(get_updates) < best_time(get_updates_by_scan)
+    assert len(VersionIndex.from_tags(tags)) == 20_000